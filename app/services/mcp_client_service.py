@@ -4,8 +4,13 @@ MCP Client Service for WhatsApp Integration
 Handles MCP client logic for meeting scheduler functionality
 """
 import asyncio
+import json
 import logging
 import os
+import random
+import re
+import time
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 from llama_index.llms.groq import Groq
 from llama_index.core import Settings
@@ -17,99 +22,187 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# One MCP client per server for the whole process, plus the discovered tool
+# list. Shared across singleton re-initializations so recovering from an
+# error doesn't pay three SSE handshakes and tool discovery again.
+_MCP_SERVER_URLS = [
+    "http://127.0.0.1:8051/sse",  # gmail
+    "http://127.0.0.1:8080/sse",  # calendar
+    "http://127.0.0.1:8081/sse",  # mom
+]
+_mcp_clients: Optional[list] = None
+_mcp_tools: Optional[list] = None
+_mcp_lock = asyncio.Lock()
+
+
+async def _get_shared_tools() -> list:
+    """Build (once) and return the process-wide MCP tool list"""
+    global _mcp_clients, _mcp_tools
+    async with _mcp_lock:
+        if _mcp_tools is None:
+            _mcp_clients = [BasicMCPClient(url) for url in _MCP_SERVER_URLS]
+            specs = [McpToolSpec(client=c) for c in _mcp_clients]
+            all_tools = []
+            for spec in specs:
+                all_tools.extend(await spec.to_tool_list_async())
+            logger.info(f"Discovered {len(all_tools)} MCP tools")
+            _mcp_tools = all_tools
+    return _mcp_tools
+
+
+def _reset_shared_tools():
+    """Drop the cached clients/tools so the next init reconnects"""
+    global _mcp_clients, _mcp_tools
+    _mcp_clients = None
+    _mcp_tools = None
+
+
+class _RateLimiter:
+    """Token-bucket limiter keeping Groq calls under the free-tier RPM cap.
+
+    Shared across all conversations in the process; callers await until a
+    slot is free instead of getting 429s rejected by the API.
+    """
+
+    def __init__(self, max_calls: int = 30, period: float = 60.0):
+        self.max_calls = max_calls
+        self.period = period
+        self._calls = []
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                self._calls = [t for t in self._calls if now - t < self.period]
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                wait = self.period - (now - self._calls[0])
+            await asyncio.sleep(wait)
+
+
+# One slot is taken per agent *turn*, but a turn makes roughly one Groq
+# call per tool round (typically up to three: select tool, observe, answer),
+# so the per-turn budget is the 30 RPM cap divided by that worst case
+_groq_limiter = _RateLimiter(max_calls=10, period=60.0)
+
+# Bounded retry policy for 429/transient network failures
+_MAX_RETRIES = 3
+
+
+def _is_retryable_error(e: Exception) -> bool:
+    """Heuristic for rate-limit and transient network failures"""
+    text = str(e).lower()
+    return any(
+        marker in text
+        for marker in ("429", "rate limit", "rate_limit", "timeout", "connection")
+    )
+
+
+# Minimal core prompt sent on every turn (~200 tokens instead of ~1.5 KB)
+CORE_SYSTEM_PROMPT = """You are a WhatsApp assistant for calendar availability, scheduling meetings, sending emails and Minutes of Meeting (MoM).
+
+Available tools: check_availability, get_schedule, schedule_meeting, schedule_meeting_today, schedule_meeting_tomorrow, send_email, send_email_to_person, send_emails_bulk, generate_mom, send_mom
+
+Rules:
+- Perform ONLY the exact action requested; call each tool at most once per request, then report the result.
+- Never schedule, email or add actions the user did not explicitly ask for.
+- Dates are YYYY-MM-DD, times are HH:MM. send_email takes a list of addresses; send_email_to_person takes a name looked up in contacts.txt.
+"""
+
+# Few-shot examples injected one-at-a-time only when the message is
+# ambiguous; keyword overlap picks the most relevant one
+_FEW_SHOT_EXAMPLES = [
+    (
+        {"free", "available", "availability"},
+        'Example: "is arun free on 2025-10-25 at 10:00" → call check_availability once with date="2025-10-25", time="10:00".',
+    ),
+    (
+        {"schedule", "meeting", "book"},
+        'Example: "schedule meeting today 14:00 to 15:00" → call schedule_meeting_today once with start_time="14:00", end_time="15:00".',
+    ),
+    (
+        {"email", "send", "mail"},
+        'Example: "send email to arun" → call send_email_to_person once with name="arun".',
+    ),
+    (
+        {"mom", "minutes", "transcript"},
+        'Example: "generate mom from <transcript>" → call generate_mom once with the transcript.',
+    ),
+]
+
+
+def _select_example(message: str) -> Optional[str]:
+    """Pick the best-matching few-shot example, or None if nothing overlaps"""
+    words = set(re.findall(r"[a-z]+", message.lower()))
+    best, best_score = None, 0
+    for keywords, example in _FEW_SHOT_EXAMPLES:
+        score = len(words & keywords)
+        if score > best_score:
+            best, best_score = example, score
+    return best
+
+
 class WhatsAppMCPClient:
     """MCP Client service for WhatsApp integration"""
     
+    # Bounds for the per-conversation Context cache
+    MAX_CONTEXTS = 512
+    CONTEXT_TTL = 3600  # seconds
+
+    # Overall wall-clock budget for one agent turn (LLM + tools)
+    TURN_TIMEOUT = 25.0  # seconds
+
     def __init__(self):
         """Initialize the MCP client for WhatsApp"""
         self.agent = None
         self.agent_context = None
         self.initialized = False
+        # LRU of {wa_id: (last_seen, Context, Lock)} so follow-up messages
+        # keep their conversation state instead of starting from scratch;
+        # the lock serializes turns per conversation (see _get_context)
+        self._contexts: OrderedDict = OrderedDict()
+        self._default_lock = asyncio.Lock()
         
-        # Initialize Groq LLM
+        # Initialize Groq LLM; tight timeout and capped output so a single
+        # message can't consume the whole rate-limit window
         self.llm = Groq(
             model="llama-3.1-8b-instant",
             api_key=os.getenv("GROQ_API_KEY"),
-            request_timeout=120.0
+            request_timeout=30.0,
+            max_tokens=512,
         )
         Settings.llm = self.llm
         
-        # System prompt for WhatsApp assistant
-        self.system_prompt = """You are a helpful WhatsApp assistant that can check calendar availability, schedule meetings, send emails, and generate/send Minutes of Meeting (MoM).
-
-CRITICAL RULE: ONLY PERFORM THE EXACT ACTION REQUESTED BY THE USER. DO NOT ADD EXTRA ACTIONS.
-
-Available tools: check_availability, get_schedule, schedule_meeting, schedule_meeting_today, schedule_meeting_tomorrow, send_email, send_email_to_person, generate_mom, send_mom
-
-STRICT USAGE RULES - CALL EACH TOOL ONLY ONCE PER USER REQUEST:
-- If user asks "is [person] free on [date] at [time]", call check_availability ONCE
-- If user asks "what's my schedule on [date]", call get_schedule ONCE
-- If user asks "schedule meeting", call schedule_meeting ONCE
-- If user asks "schedule meeting today", call schedule_meeting_today ONCE
-- If user asks "schedule meeting tomorrow", call schedule_meeting_tomorrow ONCE
-- If user asks "send email to [person]", call send_email_to_person ONCE
-- If user asks "generate mom", call generate_mom or send_mom ONCE
-
-DO NOT:
-- Call the same tool multiple times for the same request
-- Automatically schedule meetings when checking availability
-- Send emails when checking availability
-- Add extra actions not explicitly requested
-- Loop or repeat tool calls
-
-FUNCTION CALLING RULES:
-- For check_availability: Use date in YYYY-MM-DD format, time in HH:MM format
-- For send_email: Use to parameter as list format ["email@example.com"]
-- For send_email_to_person: Use name parameter (will look up email from contacts.txt)
-- For schedule_meeting: Use date in YYYY-MM-DD format, times in HH:MM format
-- For schedule_meeting_today/tomorrow: Use times in HH:MM format (date is automatic)
-
-EXAMPLES:
-- "is arun free on 2025-10-25 at 10:00" → Call check_availability ONCE with date="2025-10-25", time="10:00"
-- "send email to arun" → Call send_email_to_person ONCE with name="arun"
-- "schedule meeting today" → Call schedule_meeting_today ONCE with start_time and end_time
-
-IMPORTANT: After calling a tool once, provide the result to the user. Do not call the same tool again.
-
-"""
+        # Compact system prompt; few-shot examples are appended per message
+        # only when relevant (see _select_example)
+        self.system_prompt = CORE_SYSTEM_PROMPT
     
     async def initialize_mcp_clients(self):
         """Initialize MCP clients and agent"""
         try:
             logger.info("Initializing MCP clients for WhatsApp...")
-            
-            # Connect to MCP servers
-            gmail_client = BasicMCPClient("http://127.0.0.1:8051/sse")
-            calendar_client = BasicMCPClient("http://127.0.0.1:8080/sse")
-            mom_client = BasicMCPClient("http://127.0.0.1:8081/sse")
-            
-            mcp_tool = [
-                McpToolSpec(client=gmail_client),
-                McpToolSpec(client=calendar_client),
-                McpToolSpec(client=mom_client)
-            ]
-            
-            # Initialize agent
-            self.agent = await self._get_agent(mcp_tool)
+
+            # Tool discovery is cached process-wide; a re-init after an
+            # error reuses the live connections and tool objects
+            all_tools = await _get_shared_tools()
+            self.agent = self._get_agent(all_tools)
             self.agent_context = Context(self.agent)
             self.initialized = True
-            
+
             logger.info("MCP clients initialized successfully for WhatsApp")
-            
+
         except Exception as e:
             logger.error(f"Failed to initialize MCP clients for WhatsApp: {e}")
             self.initialized = False
+            _reset_shared_tools()
             raise
-    
-    async def _get_agent(self, mcp_tool: list[McpToolSpec]) -> FunctionAgent:
+
+    def _get_agent(self, all_tools: list) -> FunctionAgent:
         """Create and configure the function agent"""
-        all_tools = []
-        for spec in mcp_tool:
-            tools = await spec.to_tool_list_async()
-            all_tools.extend(tools)
-        
         logger.info(f"Registered {len(all_tools)} tools for WhatsApp")
-        
+
         agent = FunctionAgent(
             name="WhatsAppMeetingAgent",
             description="Agent that works with Calendar + Gmail MCP servers via WhatsApp.",
@@ -119,56 +212,266 @@ IMPORTANT: After calling a tool once, provide the result to the user. Do not cal
         )
         return agent
     
-    async def handle_user_message(self, message_content: str) -> str:
-        """Handle user message and return response"""
+    def _get_context(self, wa_id: Optional[str]):
+        """Get (or create) the Context and turn lock for a WhatsApp user.
+
+        The lock serializes agent turns per conversation: two worker
+        threads handling rapid follow-ups from the same wa_id would
+        otherwise run concurrently on one Context, which llama-index
+        does not support.
+        """
+        if wa_id is None:
+            return self.agent_context, self._default_lock
+
+        now = time.monotonic()
+        # Evict idle conversations before looking up
+        while self._contexts:
+            oldest_id, (last_seen, _, _) = next(iter(self._contexts.items()))
+            if now - last_seen > self.CONTEXT_TTL:
+                del self._contexts[oldest_id]
+            else:
+                break
+
+        entry = self._contexts.pop(wa_id, None)
+        if entry is not None:
+            _, ctx, lock = entry
+        else:
+            ctx, lock = Context(self.agent), asyncio.Lock()
+        self._contexts[wa_id] = (now, ctx, lock)
+        if len(self._contexts) > self.MAX_CONTEXTS:
+            self._contexts.popitem(last=False)
+        return ctx, lock
+
+    async def handle_user_message(self, message_content: str, on_tool_call=None, wa_id: Optional[str] = None) -> str:
+        """Handle user message and return response.
+
+        Args:
+            message_content: The user's message text
+            on_tool_call: Optional callable invoked (once per turn, with the
+                tool name) when the agent starts running tools, so the caller
+                can send an interim "working on it" notification
+            wa_id: WhatsApp user id used to keep per-conversation state
+        """
         try:
             if not self.initialized or not self.agent or not self.agent_context:
                 return "❌ Meeting scheduler is not initialized. Please try again later."
-            
+
             logger.info(f"Processing WhatsApp message: {message_content}")
-            
-            handler = self.agent.run(message_content, ctx=self.agent_context)
-            tool_call_count = 0
-            max_tool_calls = 5  # Prevent infinite loops
-            
+
+            ctx, turn_lock = self._get_context(wa_id)
+            # One turn at a time per conversation: concurrent agent.run
+            # calls on a shared Context corrupt or error the turn
+            async with turn_lock:
+                for attempt in range(_MAX_RETRIES):
+                    # Wait for an RPM slot before hitting Groq
+                    await _groq_limiter.acquire()
+                    try:
+                        # Hard budget for the whole turn so a stuck MCP
+                        # server or a hallucinated tool loop can't hold
+                        # the 120s Groq window hostage
+                        return await asyncio.wait_for(
+                            self._run_agent(message_content, on_tool_call, ctx),
+                            timeout=self.TURN_TIMEOUT,
+                        )
+                    except asyncio.TimeoutError:
+                        logger.warning("Agent turn exceeded %ss budget", self.TURN_TIMEOUT)
+                        return "⏳ That took too long to process. Please try a simpler request."
+                    except Exception as e:
+                        if not _is_retryable_error(e) or attempt == _MAX_RETRIES - 1:
+                            raise
+                        # Exponential backoff with jitter: ~1s, ~2s, ~4s
+                        delay = min(2 ** attempt, 8) + random.uniform(0, 0.5)
+                        logger.warning(f"Retryable Groq error ({e}), retrying in {delay:.1f}s")
+                        await asyncio.sleep(delay)
+
+        except Exception as e:
+            logger.error(f"Error handling WhatsApp message: {e}")
+            return f"Sorry, I encountered an error: {str(e)}"
+
+    async def _run_agent(self, message_content: str, on_tool_call=None, ctx: Optional[Context] = None) -> str:
+        """Run one agent turn and return the final response text"""
+        # Attach at most one relevant few-shot example instead of shipping
+        # the whole example library on every call
+        example = _select_example(message_content)
+        if example is not None:
+            message_content = f"{example}\n\n{message_content}"
+
+        handler = self.agent.run(message_content, ctx=ctx)
+        tool_call_count = 0
+        max_tool_calls = 3  # Prevent infinite loops; common intents need 1
+
+        try:
             async for event in handler.stream_events():
                 if isinstance(event, ToolCall):
                     tool_call_count += 1
                     if tool_call_count > max_tool_calls:
                         logger.warning(f"Too many tool calls ({tool_call_count}), stopping to prevent loop")
                         break
+                    if tool_call_count == 1 and on_tool_call is not None:
+                        # Notify once so the user sees progress while tools run;
+                        # the callback does blocking I/O, keep it off the loop
+                        asyncio.get_running_loop().run_in_executor(
+                            None, on_tool_call, event.tool_name
+                        )
                     logger.info(f"Calling tool {event.tool_name} with args {event.tool_kwargs}")
                 elif isinstance(event, ToolCallResult):
+                    if event.tool_name in _MUTATING_CALENDAR_TOOLS:
+                        # Bookings go through the agent, not the fast path;
+                        # drop the read cache here so "is X free" can't answer
+                        # from a pre-booking snapshot for up to the TTL
+                        _calendar_cache.clear()
                     logger.info(f"Tool {event.tool_name} completed")
-            
+
             response = await handler
-            logger.info(f"Generated response: {str(response)}")
-            return str(response)
-            
-        except Exception as e:
-            logger.error(f"Error handling WhatsApp message: {e}")
-            return f"Sorry, I encountered an error: {str(e)}"
+        except asyncio.CancelledError:
+            # wait_for cancelled this consumer on timeout; stop the
+            # workflow itself too, or it keeps calling Groq and tools in
+            # the background and leaves this conversation's Context
+            # attached to a still-running run
+            handler.cancel()
+            raise
+        logger.info(f"Generated response: {str(response)}")
+        return str(response)
     
     def is_initialized(self) -> bool:
         """Check if the MCP client is initialized"""
         return self.initialized
 
-async def process_message_with_mcp(message: str) -> str:
-    """Process a WhatsApp message using MCP client"""
+# Module-level singleton so the MCP connections, tool list and agent are
+# built once and reused across WhatsApp messages instead of paying three
+# SSE handshakes + tool discovery on every turn
+_mcp_client: Optional[WhatsAppMCPClient] = None
+_init_lock = asyncio.Lock()
+
+async def _get_mcp_client() -> WhatsAppMCPClient:
+    """Get the shared MCP client, initializing it on first use"""
+    global _mcp_client
+    async with _init_lock:
+        if _mcp_client is None or not _mcp_client.is_initialized():
+            client = WhatsAppMCPClient()
+            await client.initialize_mcp_clients()
+            _mcp_client = client
+    return _mcp_client
+
+async def process_message_with_mcp(message: str, on_tool_call=None, wa_id: Optional[str] = None) -> str:
+    """Process a WhatsApp message using the shared MCP client"""
+    global _mcp_client
     try:
-        # Create a fresh MCP client instance for each request
-        # This prevents event loop binding issues
-        mcp_client = WhatsAppMCPClient()
-        await mcp_client.initialize_mcp_clients()
-        
+        mcp_client = await _get_mcp_client()
+
         # Process the message
-        response = await mcp_client.handle_user_message(message)
+        response = await mcp_client.handle_user_message(message, on_tool_call, wa_id)
         return response
-        
+
     except Exception as e:
         logger.error(f"Error processing message with MCP: {e}")
+        # Drop the singleton and the shared connections so the next
+        # message rebuilds from scratch
+        _mcp_client = None
+        _reset_shared_tools()
         return f"Sorry, I encountered an error processing your request: {str(e)}"
 
+# ---- Fast intent routing ----
+# Unambiguous read-only requests are dispatched straight to the calendar
+# MCP server, skipping the ~2 Groq round-trips an agent turn costs
+
+_CALENDAR_URL = "http://127.0.0.1:8080/sse"
+_calendar_client: Optional[BasicMCPClient] = None
+
+# Short-lived cache for read-only calendar lookups: the agent (and users
+# iterating slot choices) frequently re-asks the same (tool, args) tuple
+# within one conversation turn
+_READ_ONLY_CALENDAR_TOOLS = {"check_availability", "get_schedule"}
+_MUTATING_CALENDAR_TOOLS = {
+    "schedule_meeting",
+    "schedule_meeting_today",
+    "schedule_meeting_tomorrow",
+}
+_CAL_CACHE_TTL = 30.0
+_CAL_CACHE_MAX = 1024
+_calendar_cache: Dict[tuple, tuple] = {}
+
+
+async def _call_calendar_tool(client: BasicMCPClient, tool_name: str, kwargs: Dict[str, Any]):
+    """call_tool with a short TTL cache over read-only calendar lookups"""
+    if tool_name in _MUTATING_CALENDAR_TOOLS:
+        # Defensive only: today's fast-intent patterns never dispatch a
+        # mutating tool; agent-side bookings invalidate in _run_agent
+        _calendar_cache.clear()
+        return await client.call_tool(tool_name, kwargs)
+
+    if tool_name not in _READ_ONLY_CALENDAR_TOOLS:
+        return await client.call_tool(tool_name, kwargs)
+
+    key = (tool_name, json.dumps(kwargs, sort_keys=True))
+    now = time.monotonic()
+    cached = _calendar_cache.get(key)
+    if cached and now - cached[0] < _CAL_CACHE_TTL:
+        return cached[1]
+
+    result = await client.call_tool(tool_name, kwargs)
+    if len(_calendar_cache) >= _CAL_CACHE_MAX:
+        _calendar_cache.clear()
+    _calendar_cache[key] = (now, result)
+    return result
+
+_INTENT_PATTERNS = [
+    (
+        re.compile(
+            r"^is\s+\w+\s+free\s+on\s+(?P<date>\d{4}-\d{2}-\d{2})"
+            r"(?:\s+at\s+(?P<time>\d{1,2}:\d{2}))?\s*\??$",
+            re.IGNORECASE,
+        ),
+        "check_availability",
+    ),
+    (
+        re.compile(
+            r"^what'?s\s+my\s+schedule\s+on\s+(?P<date>\d{4}-\d{2}-\d{2})\s*\??$",
+            re.IGNORECASE,
+        ),
+        "get_schedule",
+    ),
+]
+
+
+def _tool_result_text(result) -> str:
+    """Pull the text payload out of an MCP CallToolResult"""
+    try:
+        return result.content[0].text
+    except (AttributeError, IndexError, TypeError):
+        return str(result)
+
+
+async def try_fast_intent(message: str) -> Optional[str]:
+    """Dispatch trivially-parseable requests directly to the MCP tool.
+
+    Returns the formatted response, or None when the message is ambiguous
+    and needs the full LLM agent.
+    """
+    global _calendar_client
+    for pattern, tool_name in _INTENT_PATTERNS:
+        match = pattern.match(message.strip())
+        if not match:
+            continue
+        kwargs = {k: v for k, v in match.groupdict().items() if v is not None}
+        try:
+            if _calendar_client is None:
+                _calendar_client = BasicMCPClient(_CALENDAR_URL)
+            result = await _call_calendar_tool(_calendar_client, tool_name, kwargs)
+            text = _tool_result_text(result)
+            logger.info(f"Fast intent matched: {tool_name} {kwargs}")
+            try:
+                return json.loads(text).get("message", text)
+            except (json.JSONDecodeError, AttributeError):
+                return text
+        except Exception as e:
+            # Fall back to the agent rather than failing the message
+            logger.warning(f"Fast intent dispatch failed for {tool_name}: {e}")
+            _calendar_client = None
+            return None
+    return None
+
+
 def get_help_message() -> str:
     """Get help message for WhatsApp users"""
     return """*Meeting Scheduler Bot*
@@ -2,11 +2,24 @@ import logging
 from flask import current_app, jsonify
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import asyncio
+import queue
+import threading
+import time
 import re
+from dataclasses import dataclass
+from typing import Optional
 
 # Import MCP client service
-from app.services.mcp_client_service import process_message_with_mcp, get_help_message, is_help_command, is_status_command
+from app.services.mcp_client_service import process_message_with_mcp, try_fast_intent, get_help_message, is_help_command, is_status_command
+
+# One long-lived event loop in a daemon thread. Running every message on the
+# same loop keeps the MCP SSE sessions and HTTP connection pools alive between
+# webhook calls instead of tearing them down with a throwaway loop.
+_loop = asyncio.new_event_loop()
+threading.Thread(target=_loop.run_forever, daemon=True, name="mcp-loop").start()
 
 
 def log_http_response(response):
@@ -27,45 +40,74 @@ def get_text_message_input(recipient, text):
     )
 
 
-async def generate_response_async(message_text):
+async def generate_response_async(message_text, on_tool_call=None, wa_id=None):
     """Generate response using MCP client"""
     try:
         # Check for special commands
         if is_help_command(message_text):
             return get_help_message()
-        
+
         if is_status_command(message_text):
             return "✅ Meeting Scheduler Bot is online and ready to help!"
-        
+
+        # Unambiguous requests go straight to the MCP tool, skipping the LLM
+        fast_response = await try_fast_intent(message_text)
+        if fast_response is not None:
+            return fast_response
+
         # Process message with MCP client
-        response = await process_message_with_mcp(message_text)
+        response = await process_message_with_mcp(message_text, on_tool_call, wa_id)
         return response
-        
+
     except Exception as e:
         logging.error(f"Error generating response: {e}")
         return f"❌ Sorry, I encountered an error: {str(e)}"
 
-def generate_response(message_text):
+def generate_response(message_text, wa_id=None):
     """Synchronous wrapper for async MCP client"""
     try:
-        # Use nest_asyncio to allow nested event loops
-        import nest_asyncio
-        nest_asyncio.apply()
-        
-        # Run the async function in a new event loop
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            response = loop.run_until_complete(generate_response_async(message_text))
-        finally:
-            loop.close()
-        
-        return response
+        on_tool_call = None
+        if wa_id is not None:
+            app = current_app._get_current_object()
+
+            def on_tool_call(tool_name):
+                # Interim notice so the user sees progress while the
+                # agent is still running tools
+                with app.app_context():
+                    send_message(
+                        get_text_message_input(wa_id, f"⏳ Running {tool_name}…")
+                    )
+
+        # Submit the coroutine to the shared background loop so connections
+        # stay hot across requests
+        future = asyncio.run_coroutine_threadsafe(
+            generate_response_async(message_text, on_tool_call, wa_id), _loop
+        )
+        return future.result(timeout=60)
     except Exception as e:
         logging.error(f"Error in generate_response: {e}")
         return f"❌ Sorry, I encountered an error: {str(e)}"
 
 
+# Persistent session to graph.facebook.com so replies reuse keep-alive
+# connections instead of paying a TCP+TLS handshake per send; transient
+# 429/5xx responses are retried with backoff by the adapter
+_session = requests.Session()
+_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=50,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["POST"],
+        ),
+    ),
+)
+
+
 def send_message(data):
     headers = {
         "Content-type": "application/json",
@@ -75,9 +117,7 @@ def send_message(data):
     url = f"https://graph.facebook.com/{current_app.config['VERSION']}/{current_app.config['PHONE_NUMBER_ID']}/messages"
 
     try:
-        response = requests.post(
-            url, data=data, headers=headers, timeout=10
-        )  # 10 seconds timeout as an example
+        response = _session.post(url, data=data, headers=headers, timeout=(3, 10))
         response.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
     except requests.Timeout:
         logging.error("Timeout occurred while sending message")
@@ -93,97 +133,174 @@ def send_message(data):
         return response
 
 
+# Compiled once at import so the hot path skips the re-cache lookup per call
+_BRACKET_RE = re.compile(r"\【.*?\】")
+_BOLD_RE = re.compile(r"\*\*(.*?)\*\*")
+
+
 def process_text_for_whatsapp(text):
-    # Remove brackets
-    pattern = r"\【.*?\】"
-    # Substitute the pattern with an empty string
-    text = re.sub(pattern, "", text).strip()
+    # Remove 【…】 annotation brackets
+    text = _BRACKET_RE.sub("", text).strip()
 
-    # Pattern to find double asterisks including the word(s) in between
-    pattern = r"\*\*(.*?)\*\*"
+    # Convert **bold** markdown to WhatsApp-style *bold*
+    return _BOLD_RE.sub(r"*\1*", text)
 
-    # Replacement pattern with single asterisks
-    replacement = r"*\1*"
 
-    # Substitute occurrences of the pattern with the replacement
-    whatsapp_style_text = re.sub(pattern, replacement, text)
+@dataclass(slots=True)
+class WAEvent:
+    """Parsed WhatsApp webhook event"""
+    kind: str  # "status", "message" or "invalid"
+    wa_id: Optional[str] = None
+    name: Optional[str] = None
+    text: Optional[str] = None
+    msg_type: Optional[str] = None
+    msg_id: Optional[str] = None
 
-    return whatsapp_style_text
 
+def parse_webhook(body) -> WAEvent:
+    """Walk the webhook body once and classify it.
 
-def process_whatsapp_message(body):
-    """Process incoming WhatsApp message with MCP client integration"""
-    wa_id = None
+    Replaces the scattered .get chains — the tree is traversed a single
+    time with direct indexing, and non-message events (sent/delivered/read
+    statuses, ~75% of webhook traffic) are rejected cheaply.
+    """
+    if not isinstance(body, dict):
+        return WAEvent(kind="invalid")
+    try:
+        value = body["entry"][0]["changes"][0]["value"]
+    except (KeyError, IndexError, TypeError):
+        return WAEvent(kind="invalid")
+
+    if not isinstance(value, dict):
+        return WAEvent(kind="invalid")
+    if value.get("statuses"):
+        return WAEvent(kind="status")
+
+    try:
+        contact = value["contacts"][0]
+        message = value["messages"][0]
+        wa_id = contact["wa_id"]
+    except (KeyError, IndexError, TypeError):
+        return WAEvent(kind="invalid")
+
+    msg_type = message.get("type")
+    text = None
+    if msg_type == "text":
+        text = message.get("text", {}).get("body")
+    return WAEvent(
+        kind="message",
+        wa_id=wa_id,
+        name=contact.get("profile", {}).get("name", "Unknown"),
+        text=text,
+        msg_type=msg_type,
+        msg_id=message.get("id"),
+    )
+
+
+def process_whatsapp_message(event: WAEvent):
+    """Process a parsed WhatsApp message with MCP client integration"""
     try:
-        # Extract contact information
-        contacts = body["entry"][0]["changes"][0]["value"].get("contacts", [])
-        if not contacts:
-            logging.error("No contacts found in message")
-            return
-        
-        wa_id = contacts[0]["wa_id"]
-        name = contacts[0].get("profile", {}).get("name", "Unknown")
-
-        # Extract message
-        messages = body["entry"][0]["changes"][0]["value"].get("messages", [])
-        if not messages:
-            logging.error("No messages found in webhook body")
-            return
-        
-        message = messages[0]
-        message_type = message.get("type")
-        
         # Only process text messages for now
-        if message_type != "text":
-            logging.info(f"Received non-text message type: {message_type}. Only text messages are supported.")
-            error_message = f"❌ I can only process text messages. You sent a {message_type} message."
-            data = get_text_message_input(wa_id, error_message)
+        if event.msg_type != "text":
+            logging.info(f"Received non-text message type: {event.msg_type}. Only text messages are supported.")
+            error_message = f"❌ I can only process text messages. You sent a {event.msg_type} message."
+            data = get_text_message_input(event.wa_id, error_message)
             send_message(data)
             return
-        
-        if "text" not in message or "body" not in message["text"]:
-            logging.error(f"Message does not contain text body: {message}")
+
+        if event.text is None:
+            logging.error("Message does not contain text body")
             return
-        
-        message_body = message["text"]["body"]
-        logging.info(f"Processing WhatsApp message from {name} ({wa_id}): {message_body}")
+
+        logging.info(f"Processing WhatsApp message from {event.name} ({event.wa_id}): {event.text}")
 
         # Generate response using MCP client
-        response = generate_response(message_body)
-        
+        response = generate_response(event.text, event.wa_id)
+
         # Process text for WhatsApp formatting
         formatted_response = process_text_for_whatsapp(response)
-        
-        logging.info(f"Sending response to {name}: {formatted_response}")
+
+        logging.info(f"Sending response to {event.name}: {formatted_response}")
 
         # Send response back to the user
-        data = get_text_message_input(wa_id, formatted_response)
+        data = get_text_message_input(event.wa_id, formatted_response)
         send_message(data)
-        
-    except KeyError as e:
-        logging.error(f"Missing key in message structure: {e}. Full body: {json.dumps(body, indent=2)}")
-        if wa_id:
-            error_message = "❌ Sorry, I encountered an error processing your message. Please try again."
-            data = get_text_message_input(wa_id, error_message)
-            send_message(data)
+
     except Exception as e:
         logging.error(f"Error processing WhatsApp message: {e}", exc_info=True)
-        if wa_id:
+        if event.wa_id:
             # Send error message to user
             error_message = "❌ Sorry, I encountered an error processing your message. Please try again."
-            data = get_text_message_input(wa_id, error_message)
+            data = get_text_message_input(event.wa_id, error_message)
             send_message(data)
 
 
+# Bounded queue + worker threads so the webhook can return 200 to Meta
+# immediately instead of blocking a request thread for the whole LLM+tool
+# round-trip (Meta retries slow webhooks, causing duplicate deliveries)
+_task_queue = queue.Queue(maxsize=256)
+_NUM_WORKERS = 4
+
+# Seen message ids with insert timestamps, used to drop Meta's retries
+_seen_message_ids = {}
+_seen_lock = threading.Lock()
+_SEEN_TTL = 300  # seconds
+
+
+def _is_duplicate_message(event):
+    """Check (and record) the message id so webhook retries are dropped"""
+    message_id = event.msg_id
+    if message_id is None:
+        return False
+
+    now = time.monotonic()
+    with _seen_lock:
+        # Evict expired entries on insert
+        for msg_id in [m for m, ts in _seen_message_ids.items() if now - ts > _SEEN_TTL]:
+            del _seen_message_ids[msg_id]
+        if message_id in _seen_message_ids:
+            return True
+        _seen_message_ids[message_id] = now
+    return False
+
+
+def _worker():
+    while True:
+        app, event = _task_queue.get()
+        try:
+            # Workers run outside the request thread, so push an app
+            # context for current_app lookups in send_message
+            with app.app_context():
+                process_whatsapp_message(event)
+        except Exception as e:
+            logging.error(f"Worker failed to process message: {e}", exc_info=True)
+        finally:
+            _task_queue.task_done()
+
+
+for _ in range(_NUM_WORKERS):
+    threading.Thread(target=_worker, daemon=True, name="whatsapp-worker").start()
+
+
+def enqueue_whatsapp_message(event):
+    """Queue a parsed message event for background processing.
+
+    Returns False if the message is a duplicate delivery or the queue is
+    full (the caller should still ack with 200 so Meta stops retrying).
+    """
+    if _is_duplicate_message(event):
+        logging.info("Dropping duplicate WhatsApp message delivery")
+        return False
+    try:
+        _task_queue.put_nowait((current_app._get_current_object(), event))
+        return True
+    except queue.Full:
+        logging.error("WhatsApp task queue is full, dropping message")
+        return False
+
+
 def is_valid_whatsapp_message(body):
     """
     Check if the incoming webhook event has a valid WhatsApp message structure.
     """
-    return (
-        body.get("object")
-        and body.get("entry")
-        and body["entry"][0].get("changes")
-        and body["entry"][0]["changes"][0].get("value")
-        and body["entry"][0]["changes"][0]["value"].get("messages")
-        and body["entry"][0]["changes"][0]["value"]["messages"][0]
-    )
+    return parse_webhook(body).kind == "message"
@@ -1,12 +1,11 @@
 import logging
-import json
 
 from flask import Blueprint, request, jsonify, current_app
 
 from .decorators.security import signature_required
 from .utils.whatsapp_utils import (
-    process_whatsapp_message,
-    is_valid_whatsapp_message,
+    enqueue_whatsapp_message,
+    parse_webhook,
 )
 
 webhook_blueprint = Blueprint("webhook", __name__)
@@ -27,46 +26,38 @@ def handle_message():
         response: A tuple containing a JSON response and an HTTP status code.
     """
     body = request.get_json()
-    logging.info(f"request body: {json.dumps(body, indent=2)}")
 
     if not body:
         logging.error("Empty request body received")
         return jsonify({"status": "error", "message": "Empty body"}), 400
 
-    # Check if it's a WhatsApp status update
     try:
-        has_statuses = (
-            body.get("entry", [{}])[0]
-            .get("changes", [{}])[0]
-            .get("value", {})
-            .get("statuses")
-        )
-        if has_statuses:
-            logging.info("Received a WhatsApp status update.")
+        # Single-pass parse classifies the event; statuses (sent/delivered/
+        # read — the bulk of webhook traffic) are acked without further work
+        event = parse_webhook(body)
+
+        if event.kind == "status":
             return jsonify({"status": "ok"}), 200
-    except (KeyError, IndexError, AttributeError) as e:
-        logging.warning(f"Error checking for statuses: {e}")
 
-    # Check for messages
-    try:
-        if is_valid_whatsapp_message(body):
-            logging.info("Valid WhatsApp message detected, processing...")
-            process_whatsapp_message(body)
+        # Body dump only when a DEBUG handler is active (lazy %s keeps the
+        # stringification off the hot path), and only past the status check
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("request body: %s", body)
+
+        if event.kind == "message":
+            logging.info("Valid WhatsApp message detected, queueing...")
+            # Ack immediately; the actual LLM+tool round-trip runs on a
+            # background worker so Meta doesn't retry slow webhooks
+            enqueue_whatsapp_message(event)
             return jsonify({"status": "ok"}), 200
-        else:
-            # Log what we received for debugging
-            logging.warning(f"Invalid WhatsApp message structure. Body keys: {body.keys() if body else 'None'}")
-            if body.get("entry"):
-                try:
-                    value = body["entry"][0]["changes"][0]["value"]
-                    logging.warning(f"Value keys: {value.keys() if isinstance(value, dict) else 'Not a dict'}")
-                except (KeyError, IndexError):
-                    pass
-            # if the request is not a WhatsApp API event, return an error
-            return (
-                jsonify({"status": "error", "message": "Not a WhatsApp API event"}),
-                404,
-            )
+
+        # if the request is not a WhatsApp API event, return an error
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Invalid WhatsApp message structure. Body keys: %s", list(body.keys()))
+        return (
+            jsonify({"status": "error", "message": "Not a WhatsApp API event"}),
+            404,
+        )
     except Exception as e:
         logging.error(f"Error processing webhook: {e}", exc_info=True)
         return jsonify({"status": "error", "message": f"Processing error: {str(e)}"}), 500
@@ -195,7 +195,7 @@ def check_availability(date: str, time: str = None) -> str:
         date: Date in YYYY-MM-DD format (e.g., "2025-01-25")
         time: Time in HH:MM format (e.g., "10:00"), optional
     """
-    return json.dumps(calendar_server.check_availability(date, time), indent=2)
+    return json.dumps(calendar_server.check_availability(date, time), separators=(",", ":"), ensure_ascii=False)
 
 
 @server.tool()
@@ -205,7 +205,7 @@ def get_schedule(date: str) -> str:
     Args:
         date: Date in YYYY-MM-DD format (e.g., "2025-01-25")
     """
-    return json.dumps(calendar_server.get_schedule(date), indent=2)
+    return json.dumps(calendar_server.get_schedule(date), separators=(",", ":"), ensure_ascii=False)
 
 @server.tool()
 def schedule_meeting(date: str, start_time: str, end_time: str, summary: str) -> str:
@@ -217,7 +217,7 @@ def schedule_meeting(date: str, start_time: str, end_time: str, summary: str) ->
         end_time: End time in HH:MM format (e.g., "11:00")
         summary: Meeting title/description
     """
-    return json.dumps(calendar_server.schedule_meeting(date, start_time, end_time, summary), indent=2)
+    return json.dumps(calendar_server.schedule_meeting(date, start_time, end_time, summary), separators=(",", ":"), ensure_ascii=False)
 
 @server.tool()
 def schedule_meeting_today(start_time: str, end_time: str, summary: str) -> str:
@@ -230,7 +230,7 @@ def schedule_meeting_today(start_time: str, end_time: str, summary: str) -> str:
     """
     from datetime import datetime
     today = datetime.now().strftime("%Y-%m-%d")
-    return json.dumps(calendar_server.schedule_meeting(today, start_time, end_time, summary), indent=2)
+    return json.dumps(calendar_server.schedule_meeting(today, start_time, end_time, summary), separators=(",", ":"), ensure_ascii=False)
 
 @server.tool()
 def schedule_meeting_tomorrow(start_time: str, end_time: str, summary: str) -> str:
@@ -243,7 +243,7 @@ def schedule_meeting_tomorrow(start_time: str, end_time: str, summary: str) -> s
     """
     from datetime import datetime, timedelta
     tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
-    return json.dumps(calendar_server.schedule_meeting(tomorrow, start_time, end_time, summary), indent=2)
+    return json.dumps(calendar_server.schedule_meeting(tomorrow, start_time, end_time, summary), separators=(",", ":"), ensure_ascii=False)
 
 # Note: Email functionality is provided by the Gmail MCP server via send_email tool
 
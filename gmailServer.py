@@ -10,20 +10,34 @@ from typing import Dict
 from fastmcp import FastMCP
 from googleapiclient.discovery import build
 from google.oauth2.credentials import Credentials
-from email.mime.text import MIMEText
+from email.header import Header
 import base64
 
 SCOPES = ["https://www.googleapis.com/auth/gmail.send"]
 
 # ---- Contact Resolver ----
+# Cache parsed contacts per file keyed on mtime so repeated sends don't
+# re-read and re-parse contacts.txt
+_contacts_cache: Dict[str, tuple] = {}
+
 def load_contacts(file_path: str = "contacts.txt") -> Dict[str, str]:
-    contacts = {}
-    if os.path.exists(file_path):
-        with open(file_path, "r") as f:
-            for line in f:
-                if "=" in line:
-                    name, email = line.strip().split("=", 1)
-                    contacts[name.lower().strip()] = email.strip()
+    try:
+        mtime = os.stat(file_path).st_mtime
+    except OSError:
+        return {}
+
+    cached = _contacts_cache.get(file_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(file_path, "r") as f:
+        contacts = {
+            name.lower().strip(): email.strip()
+            for line in f
+            if "=" in line
+            for name, email in [line.strip().split("=", 1)]
+        }
+    _contacts_cache[file_path] = (mtime, contacts)
     return contacts
 
 def resolve_emails(names: list, contacts_file="contacts.txt") -> list:
@@ -42,14 +56,36 @@ class GmailMCPServer:
         self.creds = Credentials.from_authorized_user_file("token_gmail.json", SCOPES)
         self.service = build("gmail", "v1", credentials=self.creds)
 
+    @staticmethod
+    def build_raw_message(recipients: list, subject: str, body: str) -> str:
+        """Assemble the RFC-822 bytes directly and base64-encode them.
+
+        For the plain-text UTF-8 mail sent here this skips the whole
+        email.message construction (policy, header folding, charset
+        detection) that MIMEText pays on every call.
+        """
+        if not subject.isascii():
+            subject = Header(subject, "utf-8").encode()
+        raw = (
+            b"To: %b\r\n"
+            b"Subject: %b\r\n"
+            b"MIME-Version: 1.0\r\n"
+            b"Content-Type: text/plain; charset=\"utf-8\"\r\n"
+            b"Content-Transfer-Encoding: 8bit\r\n"
+            b"\r\n"
+            b"%b"
+        ) % (
+            ",".join(recipients).encode("utf-8"),
+            subject.encode("utf-8"),
+            body.encode("utf-8"),
+        )
+        return base64.urlsafe_b64encode(raw).decode()
+
     def send_email(self, to: list, subject: str, body: str) -> Dict[str, str]:
         try:
             print(body)
             recipients=resolve_emails(to)
-            message = MIMEText(body)
-            message["to"] = ",".join(recipients)
-            message["subject"] = subject
-            raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
+            raw = self.build_raw_message(recipients, subject, body)
 
             sent = (
                 self.service.users()
@@ -61,6 +97,41 @@ class GmailMCPServer:
         except Exception as e:
             return {"success": False, "message": f"Error: {str(e)}"}
 
+    def send_emails_bulk(self, messages: list) -> Dict[str, object]:
+        """Send several emails in one batched HTTPS request.
+
+        Args:
+            messages: List of {"to": [...], "subject": str, "body": str} dicts
+
+        Uses the Gmail API batch endpoint so N sends cost one round-trip
+        instead of N sequential ones.
+        """
+        results = []
+
+        def _collect(request_id, response, exception):
+            if exception is not None:
+                results.append({"success": False, "message": f"Error: {str(exception)}"})
+            else:
+                results.append({"success": True, "id": response["id"]})
+
+        try:
+            batch = self.service.new_batch_http_request(callback=_collect)
+            for msg in messages:
+                recipients = resolve_emails(msg["to"])
+                raw = self.build_raw_message(recipients, msg["subject"], msg["body"])
+                batch.add(
+                    self.service.users().messages().send(userId="me", body={"raw": raw})
+                )
+            batch.execute()
+            sent = sum(1 for r in results if r.get("success"))
+            return {
+                "success": sent == len(messages),
+                "message": f"Sent {sent}/{len(messages)} emails",
+                "results": results,
+            }
+        except Exception as e:
+            return {"success": False, "message": f"Error: {str(e)}"}
+
 # ---- MCP Server ----
 gmail_server = GmailMCPServer()
 server = FastMCP("GmailMCP")
@@ -74,7 +145,17 @@ def send_email(to: list, subject: str, body: str) -> str:
         subject: Email subject
         body: Email body content
     """
-    return json.dumps(gmail_server.send_email(to, subject, body), indent=2)
+    return json.dumps(gmail_server.send_email(to, subject, body), separators=(",", ":"), ensure_ascii=False)
+
+@server.tool()
+def send_emails_bulk(messages: list) -> str:
+    """Send multiple emails in one batched Gmail API request.
+
+    Args:
+        messages: List of message dicts, each with "to" (list of emails or
+            names), "subject" and "body" keys
+    """
+    return json.dumps(gmail_server.send_emails_bulk(messages), separators=(",", ":"), ensure_ascii=False)
 
 @server.tool()
 def send_email_to_person(name: str, subject: str, body: str) -> str:
@@ -94,14 +175,14 @@ def send_email_to_person(name: str, subject: str, body: str) -> str:
             email = contacts[name_key]
             result = gmail_server.send_email([email], subject, body)
             result["looked_up_email"] = email
-            return json.dumps(result, indent=2)
+            return json.dumps(result, separators=(",", ":"), ensure_ascii=False)
         else:
             return json.dumps({
                 "success": False, 
                 "message": f"Person '{name}' not found in contacts.txt. Available contacts: {list(contacts.keys())}"
-            }, indent=2)
+            }, separators=(",", ":"), ensure_ascii=False)
     except Exception as e:
-        return json.dumps({"success": False, "message": f"Error: {str(e)}"}, indent=2)
+        return json.dumps({"success": False, "message": f"Error: {str(e)}"}, separators=(",", ":"), ensure_ascii=False)
 
 if __name__ == "__main__":
     print("Starting Gmail MCP server...")
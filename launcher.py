@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Unified startup launcher for Meeting-Scheduler
+Runs all MCP servers plus the bot selected with --mode {telegram,whatsapp}
+"""
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+import socket
+import time
+import os
+import signal
+import sys
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Everything mode-specific lives in this table; the launch/supervise logic
+# below is shared so perf fixes land once instead of per-script
+MODES = {
+    "telegram": {
+        "env": ["TELEGRAM_API_KEY", "GROQ_API_KEY"],
+        "entry": "telegram_bot.py",
+        "entry_label": "Telegram bot",
+        "ready_message": "📱 Your Telegram bot is now running",
+    },
+    "whatsapp": {
+        "env": ["GROQ_API_KEY", "ACCESS_TOKEN", "VERIFY_TOKEN"],
+        "entry": "run.py",
+        "entry_label": "Flask WhatsApp app",
+        "ready_message": "📱 Your WhatsApp bot is now running on http://localhost:8000\n"
+                         "🔗 Webhook URL: http://your-domain.com/webhook",
+    },
+}
+
+
+def wait_ready(ports, timeout=30):
+    """Poll the server ports until they all accept connections"""
+    deadline = time.monotonic() + timeout
+    pending = set(ports)
+    while pending and time.monotonic() < deadline:
+        for port in list(pending):
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+                pending.discard(port)
+            except OSError:
+                pass
+        if pending:
+            time.sleep(0.05)
+    return not pending
+
+
+def _spawn(args, log_name):
+    """Start a child process with output appended to its own log file"""
+    # Undrained PIPEs deadlock children once the ~64KB OS buffer fills;
+    # append to a per-process log file instead
+    log_file = open(Path("logs") / log_name, "ab", buffering=0)
+    return subprocess.Popen(
+        args,
+        stdout=log_file,
+        stderr=subprocess.STDOUT,
+        # No preexec_fn and a fresh session lets CPython use posix_spawn,
+        # skipping the fork-time page-table copy of this parent
+        start_new_session=True,
+    )
+
+
+def start_mcp_server(script_name: str, port: int):
+    """Start an MCP server in the background"""
+    try:
+        process = _spawn(
+            [sys.executable, script_name, "--server_type", "sse"],
+            f"{Path(script_name).stem}.log",
+        )
+        print(f"✅ Started {script_name} on port {port}")
+        return process
+    except Exception as e:
+        print(f"❌ Failed to start {script_name}: {e}")
+        return None
+
+
+def start_entry(entry: str, label: str):
+    """Start the mode's bot/app process"""
+    try:
+        process = _spawn([sys.executable, entry], f"{Path(entry).stem}.log")
+        print(f"✅ Started {label}")
+        return process
+    except Exception as e:
+        print(f"❌ Failed to start {label}: {e}")
+        return None
+
+
+# Children are registered with their restart factory so the SIGCHLD
+# handler can reap and relaunch whichever process died
+process_registry = {}
+processes = []
+
+# Restart accounting per service: a child that keeps dying right after
+# launch (bad API key, port already bound) is retried with exponential
+# backoff and abandoned after MAX_RESTARTS instead of respawning in a
+# tight loop. A child that stayed up for STABLE_SECONDS resets its count.
+restart_state = {}
+MAX_RESTARTS = 5
+STABLE_SECONDS = 60
+
+
+def _register(process, factory, args=()):
+    if process:
+        processes.append(process)
+        process_registry[process.pid] = (factory, args)
+        restart_state.setdefault((factory.__name__, args), {"count": 0})["started"] = time.monotonic()
+    return process
+
+
+def child_died_handler(sig, frame):
+    """Reap dead children and restart the service they belonged to"""
+    while True:
+        try:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+        except ChildProcessError:
+            break
+        if pid == 0:
+            break
+        entry = process_registry.pop(pid, None)
+        if not entry:
+            continue
+        factory, args = entry
+        state = restart_state.setdefault((factory.__name__, args), {"count": 0, "started": 0})
+        if time.monotonic() - state.get("started", 0) >= STABLE_SECONDS:
+            state["count"] = 0
+        state["count"] += 1
+        if state["count"] > MAX_RESTARTS:
+            print(f" Process {pid} ({factory.__name__}{args}) keeps crashing; giving up after {MAX_RESTARTS} restarts")
+            continue
+        delay = min(2 ** (state["count"] - 1), 30)
+        print(f" Process {pid} exited, restarting {factory.__name__}{args} in {delay}s (attempt {state['count']}/{MAX_RESTARTS})...")
+        time.sleep(delay)
+        _register(factory(*args), factory, args)
+
+
+def signal_handler(sig, frame):
+    """Handle Ctrl+C gracefully"""
+    print("\n🛑 Shutting down servers...")
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    for process in processes:
+        if process:
+            process.terminate()
+    sys.exit(0)
+
+
+def run(mode: str):
+    """Start all services for the given mode and supervise them"""
+    config = MODES[mode]
+    print(f"🚀 Starting Meeting-Scheduler with {config['entry_label']}...")
+
+    missing_vars = [var for var in config["env"] if not os.getenv(var)]
+    if missing_vars:
+        print(f"❌ Missing required environment variables: {', '.join(missing_vars)}")
+        print("Please set these in your .env file or environment")
+        return
+
+    signal.signal(signal.SIGINT, signal_handler)
+
+    # Per-process log files live here
+    Path("logs").mkdir(exist_ok=True)
+
+    print("\n📡 Starting MCP servers...")
+    # Spawn the three servers concurrently; startup pays one exec latency
+    # instead of three in series
+    # The servers bind these ports themselves (gmailServer always 8051);
+    # readiness polling must match what they actually listen on
+    mcp_targets = [
+        ("calendarServer.py", 8080),
+        ("gmailServer.py", 8051),
+        ("momServer.py", 8081),
+    ]
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        mcp_processes = list(executor.map(lambda t: start_mcp_server(*t), mcp_targets))
+    for process, target in zip(mcp_processes, mcp_targets):
+        _register(process, start_mcp_server, target)
+
+    print("\n⏳ Waiting for servers to initialize...")
+    if not wait_ready([port for _, port in mcp_targets]):
+        print("⚠️ Warning: some MCP servers did not become ready in time")
+
+    print(f"\n📱 Starting {config['entry_label']}...")
+    entry_args = (config["entry"], config["entry_label"])
+    _register(start_entry(*entry_args), start_entry, entry_args)
+
+    print("\n✅ All services started!")
+    print(config["ready_message"])
+    print("🛑 Press Ctrl+C to stop all services")
+
+    # Sleep until a signal arrives: SIGCHLD restarts dead children,
+    # SIGINT shuts everything down. No periodic wakeups.
+    signal.signal(signal.SIGCHLD, child_died_handler)
+    try:
+        while True:
+            signal.pause()
+    except KeyboardInterrupt:
+        signal_handler(None, None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Start Meeting-Scheduler services")
+    parser.add_argument("--mode", choices=sorted(MODES), required=True,
+                        help="Which bot to run alongside the MCP servers")
+    args = parser.parse_args()
+    run(args.mode)
+
+
+if __name__ == "__main__":
+    main()
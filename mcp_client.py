@@ -5,13 +5,13 @@ Uses LlamaIndex FunctionAgent + MCP tools
 """
 
 import asyncio
-import nest_asyncio
-nest_asyncio.apply()
 import os
+import traceback
 from llama_index.llms.groq import Groq
 from llama_index.core import Settings
 from llama_index.tools.mcp import BasicMCPClient, McpToolSpec
 from llama_index.core.agent.workflow import FunctionAgent, ToolCall, ToolCallResult
+from llama_index.core.llms import ChatMessage
 from llama_index.core.workflow import Context
 from dotenv import load_dotenv
 load_dotenv()
@@ -20,49 +20,48 @@ load_dotenv()
 llm = Groq(model="llama-3.1-8b-instant",api_key=os.getenv("GROQ_API_KEY"), request_timeout=120.0)
 Settings.llm = llm
 
-SYSTEM_PROMPT = """You are a helpful assistant that can check calendar availability, schedule meetings, send emails, and generate/send Minutes of Meeting (MoM).
+# Frozen, contiguous prompt prefix: identical bytes every turn so provider-
+# side prefix caching can reuse it. Any per-call dynamic content must be
+# appended to the user turn, never edited into this block.
+STATIC_PROMPT_PREFIX = """You are an assistant for calendars, email and Minutes of Meeting (MoM).
 
-CRITICAL RULE: ONLY PERFORM THE EXACT ACTION REQUESTED BY THE USER. DO NOT ADD EXTRA ACTIONS.
+Tools: check_availability, get_schedule, schedule_meeting, schedule_meeting_today, schedule_meeting_tomorrow, send_email, send_email_to_person, generate_mom, send_mom
 
-Available tools: check_availability, get_schedule, schedule_meeting, schedule_meeting_today, schedule_meeting_tomorrow, send_email, send_email_to_person, generate_mom, send_mom
+Rules:
+- Perform ONLY the exact action requested; call each tool at most once, then report the result.
+- Dates are YYYY-MM-DD, times HH:MM; schedule_meeting_today/tomorrow take only times.
+- send_email takes to as a list like ["email@example.com"]; send_email_to_person takes a contacts.txt name.
 
-STRICT USAGE RULES - CALL EACH TOOL ONLY ONCE PER USER REQUEST:
-- If user asks "is [person] free on [date] at [time]", call check_availability ONCE
-- If user asks "what's my schedule on [date]", call get_schedule ONCE
-- If user asks "schedule meeting", call schedule_meeting ONCE
-- If user asks "schedule meeting today", call schedule_meeting_today ONCE
-- If user asks "schedule meeting tomorrow", call schedule_meeting_tomorrow ONCE
-- If user asks "send email to [person]", call send_email_to_person ONCE
-- If user asks "generate mom", call generate_mom or send_mom ONCE
-
-DO NOT:
-- Call the same tool multiple times for the same request
-- Automatically schedule meetings when checking availability
-- Send emails when checking availability
-- Add extra actions not explicitly requested
-- Loop or repeat tool calls
+Example: "is arun free on 2025-10-25 at 10:00" → check_availability(date="2025-10-25", time="10:00").
+"""
 
-FUNCTION CALLING RULES:
-- For check_availability: Use date in YYYY-MM-DD format, time in HH:MM format
-- For send_email: Use to parameter as list format ["email@example.com"]
-- For send_email_to_person: Use name parameter (will look up email from contacts.txt)
-- For schedule_meeting: Use date in YYYY-MM-DD format, times in HH:MM format
-- For schedule_meeting_today/tomorrow: Use times in HH:MM format (date is automatic)
+SYSTEM_PROMPT = STATIC_PROMPT_PREFIX
 
-EXAMPLES:
-- "is arun free on 2025-10-25 at 10:00" → Call check_availability ONCE with date="2025-10-25", time="10:00"
-- "send email to arun" → Call send_email_to_person ONCE with name="arun"
-- "schedule meeting today" → Call schedule_meeting_today ONCE with start_time and end_time
+# Built once at import: FunctionAgent validates system_prompt as a plain
+# string, so the prebuilt message hands over its content and the agent
+# itself is memoized below — the prompt-to-template conversion happens
+# once per process instead of per construction
+SYSTEM_MSG = ChatMessage(role="system", content=SYSTEM_PROMPT)
 
-IMPORTANT: After calling a tool once, provide the result to the user. Do not call the same tool again.
-
-"""
+# Tool lists and built agents memoized per spec set so repeated agent
+# builds in one process skip the discovery round-trips entirely
+_tool_list_cache: dict[tuple, list] = {}
+_agent_cache: dict[tuple, FunctionAgent] = {}
 
 async def get_agent(mcp_tool: list[McpToolSpec]) -> FunctionAgent:
-    all_tools = []
-    for spec in mcp_tool:
-        tools = await spec.to_tool_list_async()
-        all_tools.extend(tools)
+    cache_key = tuple(id(spec.client) for spec in mcp_tool)
+    agent = _agent_cache.get(cache_key)
+    if agent is not None:
+        return agent
+    all_tools = _tool_list_cache.get(cache_key)
+    if all_tools is None:
+        # Fetch the three tool lists concurrently: init latency is the
+        # slowest server's RTT instead of the sum of all three
+        tool_lists = await asyncio.gather(
+            *(spec.to_tool_list_async() for spec in mcp_tool)
+        )
+        all_tools = [t for tools in tool_lists for t in tools]
+        _tool_list_cache[cache_key] = all_tools
 
     print("Registered Tools:")
     for t in all_tools:
@@ -73,37 +72,72 @@ async def get_agent(mcp_tool: list[McpToolSpec]) -> FunctionAgent:
         description="Agent that works with Calendar + Gmail MCP servers.",
         tools=all_tools,
         llm=llm,
-        system_prompt=SYSTEM_PROMPT,
+        system_prompt=SYSTEM_MSG.content,
     )
+    _agent_cache[cache_key] = agent
     return agent
 
+# How many trailing messages survive a trim; keeps per-turn prompt size
+# (and thus Groq latency) flat instead of growing with session length
+HISTORY_WINDOW = 8
+
+async def _trim_context_history(agent_context: Context, keep: int = HISTORY_WINDOW):
+    """Drop all but the system message and the last ``keep`` messages.
+
+    Best effort: the memory layout is LlamaIndex-internal, so any surprise
+    shape just skips the trim rather than failing the turn.
+    """
+    try:
+        store = getattr(agent_context, "store", agent_context)
+        memory = await store.get("memory", default=None)
+        if memory is None:
+            return
+        history = memory.get_all()
+        if len(history) <= keep:
+            return
+        system_msgs = [m for m in history[:-keep] if m.role == "system"]
+        memory.set(system_msgs + history[-keep:])
+    except Exception:
+        pass
+
 async def handle_user_message(
     message_content: str,
     agent: FunctionAgent,
     agent_context: Context,
     verbose: bool = False,
 ):
+    handler = None
     try:
-        # Add timeout to prevent infinite loops
         handler = agent.run(message_content, ctx=agent_context)
         tool_call_count = 0
         max_tool_calls = 5  # Prevent infinite loops
-        
-        async for event in handler.stream_events():
-            if verbose and isinstance(event, ToolCall):
-                tool_call_count += 1
-                if tool_call_count > max_tool_calls:
-                    print(f"[WARNING] Too many tool calls ({tool_call_count}), stopping to prevent loop")
-                    break
-                print(f"[TOOL] Calling tool {event.tool_name} with args {event.tool_kwargs}")
-            elif verbose and isinstance(event, ToolCallResult):
-                print(f"[RESULT] Tool {event.tool_name} returned {event.tool_output}")
-
-        response = await handler
+
+        # Hard wall-clock budget: on overrun the handler is cancelled so
+        # the agent stops generating instead of burning tokens after the
+        # caller has given up
+        async with asyncio.timeout(30):
+            async for event in handler.stream_events():
+                if verbose and isinstance(event, ToolCall):
+                    tool_call_count += 1
+                    if tool_call_count > max_tool_calls:
+                        print(f"[WARNING] Too many tool calls ({tool_call_count}), stopping to prevent loop")
+                        break
+                    print(f"[TOOL] Calling tool {event.tool_name} with args {event.tool_kwargs}")
+                elif verbose and isinstance(event, ToolCallResult):
+                    print(f"[RESULT] Tool {event.tool_name} returned {event.tool_output}")
+
+            response = await handler
+        # Cap history after every turn so attention cost stays O(window),
+        # not O(turns²) over a long session
+        await _trim_context_history(agent_context)
         return str(response)
+    except TimeoutError:
+        print("[WARNING] Agent run exceeded 30s budget, cancelling")
+        if handler is not None:
+            handler.cancel()
+        return "⏳ Still working, please try a simpler request."
     except Exception as e:
         print(f"[ERROR] Error handling user message: {e}")
-        import traceback
         traceback.print_exc()
         return f"Sorry, I encountered an error: {str(e)}"
 
@@ -129,14 +163,15 @@ async def main():
         print("\nCalendar Agent Ready (Groq)! Type 'exit' to quit.\n")
 
         while True:
-            user_input = input("You: ")
+            # Read input on a worker thread so SSE keepalives and any
+            # background agent work keep running while the user types
+            user_input = await asyncio.to_thread(input, "You: ")
             if user_input.strip().lower() == "exit":
                 break
             response = await handle_user_message(user_input, agent, agent_context, verbose=True)
             print("Agent:", response, "\n")
     except Exception as e:
         print(f"Fatal error in main: {e}")
-        import traceback
         traceback.print_exc()
 
 if __name__ == "__main__":
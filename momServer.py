@@ -4,24 +4,46 @@ MoM MCP Server
 Exposes: generate_mom, send_mom
 """
 import argparse
+import asyncio
+import hashlib
 import json
 import os
+import traceback
+from collections import OrderedDict
+import httpx
 from fastmcp import FastMCP
 from llama_index.llms.groq import Groq
 from llama_index.core import Settings
 from llama_index.tools.mcp import BasicMCPClient
+from utils.contacts import load_contacts
 from dotenv import load_dotenv
 load_dotenv()
 
 
 class MoMServer:
+    # Max cached MoM responses (retries and test loops often replay the
+    # same transcript; a hit skips the whole Groq round-trip)
+    CACHE_SIZE = 128
+
     def __init__(self):
+        self._mom_cache: OrderedDict = OrderedDict()
+        self.cache_enabled = True
         try:
-            # Initialize Groq LLM
+            # Initialize Groq LLM over an explicitly pooled httpx client so
+            # concurrent MoM generations reuse keep-alive connections
+            # instead of paying a TLS handshake per call
+            self.http_client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=20,
+                    max_keepalive_connections=16,
+                ),
+                timeout=120.0,
+            )
             self.llm = Groq(
                 model="llama-3.1-8b-instant",
                 api_key=os.getenv("GROQ_API_KEY"),
                 request_timeout=120.0,
+                http_client=self.http_client,
             )
             Settings.llm = self.llm
 
@@ -30,18 +52,38 @@ class MoMServer:
             print(f"[ERROR] Failed to initialize MoMServer: {e}")
             raise
 
+    def generate_mom_stream(self, transcript: str):
+        """Yield MoM text chunks as Groq streams the completion."""
+        prompt = f"""
+        Convert the following meeting transcript into structured Minutes of Meeting (MoM).
+        Include: Agenda, Key Points, Decisions, Action Items (with owners).
+
+        Transcript:
+        {transcript}
+        """
+        for chunk in self.llm.stream_complete(prompt):
+            yield chunk.delta
+
     def generate_mom(self, transcript: str) -> str:
         """Convert transcript to structured MoM."""
         try:
-            prompt = f"""
-            Convert the following meeting transcript into structured Minutes of Meeting (MoM).
-            Include: Agenda, Key Points, Decisions, Action Items (with owners).
-
-            Transcript:
-            {transcript}
-            """
-            response = self.llm.complete(prompt)
-            return response.text
+            key = None
+            if self.cache_enabled:
+                # BLAKE2b is fast and dependency-free; 16 bytes is plenty
+                key = hashlib.blake2b(transcript.encode(), digest_size=16).hexdigest()
+                cached = self._mom_cache.get(key)
+                if cached is not None:
+                    self._mom_cache.move_to_end(key)
+                    return cached
+
+            # Single O(n) join over the streamed chunks
+            mom = "".join(self.generate_mom_stream(transcript))
+
+            if key is not None:
+                self._mom_cache[key] = mom
+                if len(self._mom_cache) > self.CACHE_SIZE:
+                    self._mom_cache.popitem(last=False)
+            return mom
         except Exception as e:
             print(f"[ERROR] generate_mom failed: {e}")
             raise
@@ -51,6 +93,17 @@ class MoMServer:
 mom_server = MoMServer()
 server = FastMCP("MoMMCP")
 
+# Lazily created once and reused so each send_mom call doesn't pay a fresh
+# SSE handshake + tool-schema fetch to the Gmail server
+_GMAIL_URL = "http://127.0.0.1:8051/sse"
+_gmail_client = None
+
+def _get_gmail_client() -> BasicMCPClient:
+    global _gmail_client
+    if _gmail_client is None:
+        _gmail_client = BasicMCPClient(_GMAIL_URL)
+    return _gmail_client
+
 @server.tool(description="Generate Minutes of Meeting (MoM) from transcript")
 def generate_mom(transcript: str) -> str:
     return mom_server.generate_mom(transcript)
@@ -68,25 +121,32 @@ async def send_mom(names: str, transcript: str) -> str:
         transcript: Meeting transcript to convert into MoM
     """
     try:
-        # Step 1: Parse names and resolve emails
-        name_list = [name.strip() for name in names.split(",") if name.strip()]
-        
-        # Step 2: Generate MoM
+        # Step 1: Generate MoM in a worker thread (the Groq stream is
+        # consumed synchronously); recipient resolution below runs while
+        # it streams. The Gmail connection itself only opens on the
+        # call_tool below, so there is nothing to warm up here.
         print("📌 Step 1: Generating MoM from transcript...")
-        mom = mom_server.generate_mom(transcript)
+        mom_task = asyncio.create_task(
+            asyncio.to_thread(mom_server.generate_mom, transcript)
+        )
+
+        # Step 2: Parse names and resolve emails locally so one email with
+        # all addresses goes out instead of the Gmail side resolving names
+        name_list = [name.strip() for name in names.split(",") if name.strip()]
+        # Shared mtime-cached contact map from utils.contacts
+        contacts = load_contacts()
+        # Unknown names pass through unchanged (assumed to be addresses)
+        recipients = [contacts.get(n.lower(), n) for n in name_list]
+
+        gmail_client = _get_gmail_client()
+        mom = await mom_task
         print("✅ MoM generated successfully.")
-        
+
         # Step 3: Send email with the generated MoM
         print("📌 Step 2: Sending email with generated MoM...")
-        # Import here to avoid circular imports
-        from llama_index.tools.mcp import BasicMCPClient
-        
-        # Create Gmail client
-        gmail_client = BasicMCPClient("http://127.0.0.1:8051/sse")
-        
         # Send email with the generated MoM content
         response = await gmail_client.call_tool("send_email", {
-            "to": name_list,
+            "to": recipients,
             "subject": "Minutes of Meeting (MoM)",
             "body": mom,
         })
@@ -106,9 +166,11 @@ async def send_mom(names: str, transcript: str) -> str:
         })
         
     except Exception as e:
+        global _gmail_client
         print(f"[ERROR] send_mom failed: {e}")
-        import traceback
         traceback.print_exc()
+        # Drop the cached client so the next call reconnects
+        _gmail_client = None
         return json.dumps({
             "success": False,
             "error": str(e)
@@ -131,5 +193,12 @@ if __name__ == "__main__":
         default=8081,
         help="Port for MoM MCP server",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the transcript-hash MoM response cache",
+    )
     args = parser.parse_args()
+    if args.no_cache:
+        mom_server.cache_enabled = False
     server.run(args.server_type, port=args.port)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Shared Google OAuth bootstrap
+Used by setup_email.py and setup_google_calendar.py so the credential
+flow lives in one place and both scopes can be granted in a single run
+"""
+
+import json
+import os
+from google_auth_oauthlib.flow import InstalledAppFlow
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+
+GMAIL_SCOPES = ['https://www.googleapis.com/auth/gmail.send']
+CALENDAR_SCOPES = ['https://www.googleapis.com/auth/calendar']
+
+
+def bootstrap_oauth(scopes, token_path, port):
+    """Run the OAuth flow for the given scopes, reusing a saved token.
+
+    Returns True on success, False when credentials.json is missing.
+    """
+    if not os.path.exists('credentials.json'):
+        print("❌ credentials.json not found!")
+        print("\n📋 To set up Google API access:")
+        print("1. Go to https://console.cloud.google.com/")
+        print("2. Create a new project or select existing one")
+        print("3. Enable the required APIs (Gmail and/or Calendar)")
+        print("4. Create credentials (OAuth 2.0 Client ID)")
+        print("5. Download the credentials.json file")
+        print("6. Place it in this directory")
+        return False
+
+    creds = None
+
+    # Check if we already have a token. creds.valid only checks expiry,
+    # so compare the scopes the saved token was actually granted against
+    # the ones requested: a Gmail-only token must not be reused for the
+    # combined Gmail+Calendar flow.
+    if os.path.exists(token_path):
+        creds = Credentials.from_authorized_user_file(token_path, scopes)
+        try:
+            with open(token_path) as f:
+                granted = set(json.load(f).get("scopes") or [])
+        except (OSError, json.JSONDecodeError):
+            granted = set()
+        if not granted.issuperset(scopes):
+            creds = None
+
+    # If there are no (valid) credentials available, let the user log in
+    if not creds or not creds.valid:
+        if creds and creds.expired and creds.refresh_token:
+            creds.refresh(Request())
+        else:
+            flow = InstalledAppFlow.from_client_secrets_file('credentials.json', scopes)
+            creds = flow.run_local_server(port=port, access_type='offline', prompt='consent')
+
+        # Save the credentials for the next run
+        with open(token_path, 'w') as token:
+            token.write(creds.to_json())
+
+    return True
+
+
+def setup_all(port=8888):
+    """Grant Gmail + Calendar access in one combined consent screen.
+
+    One browser round-trip instead of two sequential flows; the combined
+    token is written to both token files so the servers keep working
+    unchanged.
+    """
+    scopes = GMAIL_SCOPES + CALENDAR_SCOPES
+    if not bootstrap_oauth(scopes, 'token_gmail.json', port):
+        return False
+    # Both servers read their own token file; share the combined token
+    with open('token_gmail.json') as f:
+        token_json = f.read()
+    with open('token_calendar.json', 'w') as f:
+        f.write(token_json)
+    print("✅ Gmail + Calendar access set up successfully!")
+    return True
+
+
+if __name__ == "__main__":
+    setup_all()
@@ -5,6 +5,23 @@ from app import create_app
 
 app = create_app()
 
+# ASGI wrapper so the webhook can run under uvicorn (`uvicorn run:asgi_app`).
+# a2wsgi still runs each Flask request on a threadpool worker; the gain is
+# uvicorn's connection handling (keep-alive, slow clients parked on the
+# event loop) rather than request-level async concurrency
+try:
+    from a2wsgi import WSGIMiddleware
+
+    asgi_app = WSGIMiddleware(app)
+except ImportError:
+    asgi_app = None
+
 if __name__ == "__main__":
-    logging.info("Flask app started")
-    app.run(host="0.0.0.0", port=8000)
+    if asgi_app is not None:
+        import uvicorn
+
+        logging.info("Starting WhatsApp app under uvicorn (ASGI)")
+        uvicorn.run(asgi_app, host="0.0.0.0", port=8000)
+    else:
+        logging.info("Flask app started")
+        app.run(host="0.0.0.0", port=8000, threaded=True)
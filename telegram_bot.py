@@ -5,7 +5,13 @@ Handles Telegram messages and integrates with MCP client
 """
 import asyncio
 import os
+import signal
+import json
 import logging
+import re
+import time
+from collections import OrderedDict, defaultdict, deque
+from datetime import date
 from typing import Dict, Any
 from telegram import Update
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
@@ -13,12 +19,22 @@ from dotenv import load_dotenv
 from llama_index.llms.groq import Groq
 from llama_index.core import Settings
 from llama_index.tools.mcp import BasicMCPClient, McpToolSpec
-from llama_index.core.agent.workflow import FunctionAgent, ToolCall, ToolCallResult
+from llama_index.core.agent.workflow import AgentStream, FunctionAgent, ToolCall, ToolCallResult
 from llama_index.core.workflow import Context
+from utils.call_mcp_tool import call_mcp_tool
 
 # Load environment variables
 load_dotenv()
 
+# libuv-based event loop: noticeably lower per-callback overhead for the
+# socket-heavy mix of Telegram updates, Groq calls and three SSE streams.
+# Unavailable on Windows, where the default loop is used instead.
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    uvloop = None
+
 # Configure logging
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -26,101 +42,341 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# MCP clients are created once and reused for the life of the process.
+# BasicMCPClient manages its own SSE transport and does not take an
+# injected httpx client, so pooling here means keeping the same client
+# objects — and their keep-alive connections — across agent rebuilds
+# instead of paying a fresh TCP handshake per reinitialization.
+_MCP_SERVER_URLS = [
+    "http://127.0.0.1:8051/sse",  # gmail
+    "http://127.0.0.1:8080/sse",  # calendar
+    "http://127.0.0.1:8081/sse",  # mom
+]
+# Frozen at import and byte-identical on every turn: keeping the static
+# rules in one contiguous block (and all dynamic content in the user turn)
+# lets provider-side prefix caching reuse the prefill across sessions.
+SYSTEM_PROMPT = """You are an assistant for calendars, email and Minutes of Meeting (MoM).
+
+Tools: check_availability, get_schedule, schedule_meeting, schedule_meeting_today, schedule_meeting_tomorrow, send_email, send_email_to_person, generate_mom, send_mom
+
+Rules:
+- Perform ONLY the exact action requested; call each tool at most once, then report the result.
+- Dates are YYYY-MM-DD, times HH:MM; schedule_meeting_today/tomorrow take only times.
+- send_email takes to as a list like ["email@example.com"]; send_email_to_person takes a contacts.txt name.
+
+Example: "is arun free on 2025-10-25 at 10:00" → check_availability(date="2025-10-25", time="10:00").
+"""
+
+_mcp_clients = None
+
+# Index of the calendar server in _MCP_SERVER_URLS / _get_mcp_clients()
+_CALENDAR = 1
+
+# Sentinel an event handler returns to stop consuming the stream
+_STOP_STREAM = object()
+
+# Short messages carrying one of these are almost always bare tool
+# invocations; they route to the capped fast LLM tier first
+_TOOLY_RE = re.compile(
+    r"\b(schedule|meeting|free|availability|email|mom)\b", re.IGNORECASE
+)
+
+# The fast tier only carries read-only tools: its failure path falls back
+# to the full agent, and a fallback after a booking or email already
+# fired would repeat the side effect
+_FAST_TIER_TOOLS = {"check_availability", "get_schedule"}
+
+# Messages asking for a state change skip the fast tier entirely — the
+# fast agent couldn't execute them anyway (see _FAST_TIER_TOOLS)
+_MUTATING_RE = re.compile(
+    r"\b(book|send|email|mail|mom)\b|\bschedule\s+(?:a\s+|an\s+|my\s+)?meeting\b",
+    re.IGNORECASE,
+)
+
+# Shared date/time fragments: every parser below is composed from these
+# and compiled once at import
+_DATE_SRC = r"\d{4}-\d{2}-\d{2}"
+_TIME_SRC = r"\d{1,2}:\d{2}"
+DATE_RE = re.compile(rf"\b({_DATE_SRC})\b")
+TIME_RE = re.compile(rf"\b({_TIME_SRC})\b")
+
+
+def today_iso() -> str:
+    """Today's date as YYYY-MM-DD (local time)"""
+    # Cheap enough to compute per call; any caching keyed on epoch hours
+    # returns yesterday's date after midnight in half-hour-offset zones
+    return date.today().isoformat()
+
+
+# Unambiguous read-only requests are dispatched straight to the calendar
+# tool, turning a 1-2s LLM routing round-trip into a regex match. Only
+# fully-specified patterns short-circuit; anything else goes to the agent.
+# Patterns without a date group mean "today".
+_INTENT_PATTERNS = [
+    (
+        re.compile(
+            rf"^is\s+\w+\s+free\s+on\s+(?P<date>{_DATE_SRC})"
+            rf"(?:\s+at\s+(?P<time>{_TIME_SRC}))?\s*\??$",
+            re.IGNORECASE,
+        ),
+        "check_availability",
+    ),
+    (
+        re.compile(
+            rf"^is\s+\w+\s+free\s+today"
+            rf"(?:\s+at\s+(?P<time>{_TIME_SRC}))?\s*\??$",
+            re.IGNORECASE,
+        ),
+        "check_availability",
+    ),
+    (
+        re.compile(
+            rf"^what'?s\s+my\s+schedule\s+on\s+(?P<date>{_DATE_SRC})\s*\??$",
+            re.IGNORECASE,
+        ),
+        "get_schedule",
+    ),
+    (
+        re.compile(
+            r"^what'?s\s+my\s+schedule\s+today\s*\??$",
+            re.IGNORECASE,
+        ),
+        "get_schedule",
+    ),
+]
+
+
+# Relaxed, unanchored variants of the intent grammar used for speculative
+# dispatch: they guess which idempotent calendar read the agent is about to
+# make so the call can start while the LLM is still decoding.
+_SPECULATIVE_PATTERNS = [
+    (
+        re.compile(
+            rf"\bfree\b.*?(?P<date>{_DATE_SRC})"
+            rf"(?:.*?\bat\s+(?P<time>{_TIME_SRC}))?",
+            re.IGNORECASE,
+        ),
+        "check_availability",
+    ),
+    (
+        re.compile(
+            rf"\bschedule\b.*?\bon\s+(?P<date>{_DATE_SRC})",
+            re.IGNORECASE,
+        ),
+        "get_schedule",
+    ),
+]
+
+
+def _speculative_parse(message: str):
+    """Guess the read-only calendar call a message will trigger, if any"""
+    for pattern, tool_name in _SPECULATIVE_PATTERNS:
+        match = pattern.search(message)
+        if match:
+            kwargs = {k: v for k, v in match.groupdict().items() if v is not None}
+            return tool_name, kwargs
+    return None
+
+
+# Rolling per-tool latency samples (last 256 calls each); enough for p95
+# visibility under load without an external metrics dependency
+_tool_latencies: Dict[str, deque] = defaultdict(lambda: deque(maxlen=256))
+
+
+def _record_tool_latency(tool_name: str, seconds: float):
+    _tool_latencies[tool_name].append(seconds)
+
+
+def get_tool_latency_stats() -> Dict[str, Dict[str, float]]:
+    """Return {tool: {count, p50, p95}} over the recent samples"""
+    stats = {}
+    for tool_name, samples in _tool_latencies.items():
+        ordered = sorted(samples)
+        if not ordered:
+            continue
+        stats[tool_name] = {
+            "count": len(ordered),
+            "p50": ordered[len(ordered) // 2],
+            "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        }
+    return stats
+
+
+# Canned replies built once at import and sent as plain text: no
+# per-call string assembly and no Telegram-side Markdown parse per send
+WELCOME_MESSAGE = """Meeting Scheduler Bot
+
+I can help you with:
+• Check availability
+• Schedule meetings
+• Send emails
+• Get schedule
+• Generate MoM
+
+Just send me a message and I'll help you!"""
+
+HELP_MESSAGE = """📋 Available Commands:
+
+Availability & Scheduling:
+• "is [person] free on [date] at [time]"
+• "schedule meeting today"
+• "schedule meeting tomorrow"
+• "what's my schedule on [date]"
+
+Email & Communication:
+• "send email to [person]"
+• "generate mom from [transcript]"
+
+Examples:
+• "is arun free on 2025-10-25 at 10:00"
+• "schedule meeting today at 2:00 PM"
+• "send email to arun"
+• "what's my schedule on 2025-10-25"
+
+Type any of these commands and I'll help you!"""
+
+
+class _RateLimiter:
+    """Sliding-window limiter for outgoing Telegram sends per chat.
+
+    Callers await until a slot frees up instead of having Telegram drop
+    the message at its per-chat rate cap.
+    """
+
+    def __init__(self, max_calls: int = 20, period: float = 60.0):
+        self.max_calls = max_calls
+        self.period = period
+        self._calls = []
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        while True:
+            async with self._lock:
+                now = time.monotonic()
+                self._calls = [t for t in self._calls if now - t < self.period]
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                wait = self.period - (now - self._calls[0])
+            await asyncio.sleep(wait)
+
+
+def _tool_result_text(result) -> str:
+    """Pull the text payload out of an MCP CallToolResult"""
+    try:
+        return result.content[0].text
+    except (AttributeError, IndexError, TypeError):
+        return str(result)
+
+def _get_mcp_clients() -> list:
+    global _mcp_clients
+    if _mcp_clients is None:
+        _mcp_clients = [BasicMCPClient(url) for url in _MCP_SERVER_URLS]
+    return _mcp_clients
+
 class TelegramMeetingScheduler:
     """Telegram bot integration for Meeting-Scheduler"""
-    
+
+    # Minimum seconds between streaming edits of the placeholder reply
+    STREAM_EDIT_INTERVAL = 0.4
+
+    # Safety net on tool invocations per turn; repeats are caught earlier
+    MAX_TOOL_CALLS = 2
+
+    # Telegram rejects messages over 4096 chars; chunk slightly below it
+    MAX_MESSAGE_LEN = 4000
+
+    # How long the per-chat worker waits for a follow-up message before
+    # submitting the turn; a rapid burst becomes one LLM call
+    COALESCE_WINDOW = 0.5
+
+    # Bounds for the per-chat Context cache: idle conversations are
+    # dropped after the TTL and the least recently used chat is evicted
+    # once the cap is hit, keeping memory flat under many users
+    MAX_CONTEXTS = 1000
+    CONTEXT_TTL = 1800
+
     def __init__(self):
         """Initialize the Telegram bot with MCP client integration"""
         self.telegram_token = os.getenv("TELEGRAM_API_KEY")
         if not self.telegram_token:
             raise ValueError("TELEGRAM_API_KEY environment variable is required")
         
-        # Initialize Groq LLM
-        self.llm = Groq(
+        # Initialize Groq LLMs: the heavy tier handles free-form
+        # conversation, the fast tier is capped and deterministic for
+        # messages that are pure tool invocations
+        self.llm_heavy = Groq(
             model="llama-3.1-8b-instant",
             api_key=os.getenv("GROQ_API_KEY"),
             request_timeout=120.0
         )
+        self.llm_fast = Groq(
+            model="llama-3.1-8b-instant",
+            api_key=os.getenv("GROQ_API_KEY"),
+            request_timeout=30.0,
+            max_tokens=128,
+            temperature=0,
+        )
+        self.llm = self.llm_heavy
         Settings.llm = self.llm
         
         # Initialize MCP clients
         self.mcp_clients = None
         self.agent = None
+        self.agent_fast = None
         self.agent_context = None
-        
-        # System prompt for the assistant
-        self.system_prompt = """You are a helpful assistant that can check calendar availability, schedule meetings, send emails, and generate/send Minutes of Meeting (MoM).
-
-CRITICAL RULE: ONLY PERFORM THE EXACT ACTION REQUESTED BY THE USER. DO NOT ADD EXTRA ACTIONS.
-
-Available tools: check_availability, get_schedule, schedule_meeting, schedule_meeting_today, schedule_meeting_tomorrow, send_email, send_email_to_person, generate_mom, send_mom
-
-STRICT USAGE RULES - CALL EACH TOOL ONLY ONCE PER USER REQUEST:
-- If user asks "is [person] free on [date] at [time]", call check_availability ONCE
-- If user asks "what's my schedule on [date]", call get_schedule ONCE
-- If user asks "schedule meeting", call schedule_meeting ONCE
-- If user asks "schedule meeting today", call schedule_meeting_today ONCE
-- If user asks "schedule meeting tomorrow", call schedule_meeting_tomorrow ONCE
-- If user asks "send email to [person]", call send_email_to_person ONCE
-- If user asks "generate mom", call generate_mom or send_mom ONCE
-
-DO NOT:
-- Call the same tool multiple times for the same request
-- Automatically schedule meetings when checking availability
-- Send emails when checking availability
-- Add extra actions not explicitly requested
-- Loop or repeat tool calls
-
-FUNCTION CALLING RULES:
-- For check_availability: Use date in YYYY-MM-DD format, time in HH:MM format
-- For send_email: Use to parameter as list format ["email@example.com"]
-- For send_email_to_person: Use name parameter (will look up email from contacts.txt)
-- For schedule_meeting: Use date in YYYY-MM-DD format, times in HH:MM format
-- For schedule_meeting_today/tomorrow: Use times in HH:MM format (date is automatic)
-
-EXAMPLES:
-- "is arun free on 2025-10-25 at 10:00" → Call check_availability ONCE with date="2025-10-25", time="10:00"
-- "send email to arun" → Call send_email_to_person ONCE with name="arun"
-- "schedule meeting today" → Call schedule_meeting_today ONCE with start_time and end_time
-
-IMPORTANT: After calling a tool once, provide the result to the user. Do not call the same tool again.
 
-"""
+        # Per-chat FIFO queues with one worker task each: messages within a
+        # chat stay ordered while unrelated chats are handled concurrently
+        # instead of head-of-line blocking behind one long agent run
+        self._chat_queues: Dict[int, asyncio.Queue] = {}
+        self._chat_workers: Dict[int, asyncio.Task] = {}
+        self._chat_send_limiters: Dict[int, _RateLimiter] = {}
+        # chat_id -> (last_seen, Context), LRU order
+        self._chat_contexts: OrderedDict = OrderedDict()
+        
+        # Frozen module-level prompt; see SYSTEM_PROMPT above
+        self.system_prompt = SYSTEM_PROMPT
     
     async def initialize_mcp_clients(self):
         """Initialize MCP clients and agent"""
         try:
             logger.info("Initializing MCP clients...")
             
-            # Connect to MCP servers
-            gmail_client = BasicMCPClient("http://127.0.0.1:8000/sse")
-            calendar_client = BasicMCPClient("http://127.0.0.1:8080/sse")
-            mom_client = BasicMCPClient("http://127.0.0.1:8081/sse")
-            
-            mcp_tool = [
-                McpToolSpec(client=gmail_client),
-                McpToolSpec(client=calendar_client),
-                McpToolSpec(client=mom_client)
-            ]
+            # Reuse the shared, long-lived MCP clients
+            self.mcp_clients = _get_mcp_clients()
+            mcp_tool = [McpToolSpec(client=client) for client in self.mcp_clients]
             
             # Initialize agent
             self.agent = await self._get_agent(mcp_tool)
+            fast_tools = [
+                t for t in self.agent.tools if t.metadata.name in _FAST_TIER_TOOLS
+            ]
+            self.agent_fast = FunctionAgent(
+                name="TelegramMeetingAgentFast",
+                description="Terse read-only tool tier for simple requests.",
+                tools=fast_tools,
+                llm=self.llm_fast,
+                system_prompt=SYSTEM_PROMPT,
+            )
             self.agent_context = Context(self.agent)
             
             logger.info("MCP clients initialized successfully")
             
         except Exception as e:
-            logger.error(f"Failed to initialize MCP clients: {e}")
+            logger.error("Failed to initialize MCP clients: %s", e)
             raise
     
     async def _get_agent(self, mcp_tool: list[McpToolSpec]) -> FunctionAgent:
         """Create and configure the function agent"""
-        all_tools = []
-        for spec in mcp_tool:
-            tools = await spec.to_tool_list_async()
-            all_tools.extend(tools)
-        
-        logger.info(f"Registered {len(all_tools)} tools")
+        # Fetch the three tool lists concurrently so startup pays the
+        # slowest server's round-trip instead of the sum of all three
+        tool_lists = await asyncio.gather(
+            *(spec.to_tool_list_async() for spec in mcp_tool)
+        )
+        all_tools = [tool for tools in tool_lists for tool in tools]
+
+        logger.info("Registered %d tools", len(all_tools))
         
         agent = FunctionAgent(
             name="TelegramMeetingAgent",
@@ -131,99 +387,388 @@ IMPORTANT: After calling a tool once, provide the result to the user. Do not cal
         )
         return agent
     
-    async def handle_user_message(self, message_content: str) -> str:
-        """Handle user message and return response"""
+    async def _try_fast_intent(self, message: str):
+        """Dispatch trivially-parseable requests directly to the MCP tool.
+
+        Returns the formatted response, or None when the message is
+        ambiguous or the direct call fails (the agent then handles it).
+        """
+        for pattern, tool_name in _INTENT_PATTERNS:
+            match = pattern.match(message.strip())
+            if not match:
+                continue
+            kwargs = {k: v for k, v in match.groupdict().items() if v is not None}
+            kwargs.setdefault("date", today_iso())
+            try:
+                client = _get_mcp_clients()[_CALENDAR]
+                result = await call_mcp_tool(client, tool_name, kwargs)
+                if not result.success:
+                    # Transport failure; let the agent retry
+                    return None
+                text = _tool_result_text(result.value)
+                logger.info("Fast intent matched: %s %s", tool_name, kwargs)
+                try:
+                    return json.loads(text).get("message", text)
+                except (json.JSONDecodeError, AttributeError):
+                    return text
+            except Exception as e:
+                logger.warning("Fast intent dispatch failed for %s: %s", tool_name, e)
+                return None
+        return None
+
+    async def _on_agent_stream(self, event, state):
+        if event.delta and state["on_delta"]:
+            state["streamed_text"] += event.delta
+            state["on_delta"](state["streamed_text"])
+
+    async def _on_tool_call(self, event, state):
+        state["tool_call_count"] += 1
+        if state["speculative_task"] is not None and state["tool_call_count"] == 1:
+            task, state["speculative_task"] = state["speculative_task"], None
+            # The guess must match the agent's kwargs exactly: if the real
+            # call is more specific (e.g. it adds a time the relaxed
+            # pattern missed), the speculative whole-day result would be
+            # the wrong answer
+            if (
+                event.tool_name == state["spec_tool"]
+                and dict(event.tool_kwargs) == state["spec_kwargs"]
+            ):
+                # The agent committed to the call already in flight: use
+                # its result and skip the agent's own dispatch +
+                # summarization round-trips. Any failure just abandons the
+                # speculation; the agent's own dispatch proceeds as usual.
+                try:
+                    result = await task
+                except Exception as e:
+                    logger.warning("Speculative call %s failed: %s", state["spec_tool"], e)
+                    return None
+                if result.success:
+                    state["handler"].cancel()
+                    text = _tool_result_text(result.value)
+                    try:
+                        text = json.loads(text).get("message", text)
+                    except (json.JSONDecodeError, AttributeError):
+                        pass
+                    logger.info("Speculative dispatch hit: %s %s", state["spec_tool"], state["spec_kwargs"])
+                    if state["on_delta"]:
+                        state["on_delta"](text)
+                    return text
+            else:
+                task.cancel()
+        # An identical repeated call means the agent is looping; cut it
+        # off immediately instead of paying another LLM round-trip per
+        # repeat (json key: kwargs can hold unhashable values like
+        # recipient lists)
+        call_key = (event.tool_name, json.dumps(event.tool_kwargs, sort_keys=True, default=str))
+        if call_key in state["seen_calls"]:
+            logger.warning("Repeated tool call %s, stopping to prevent loop", event.tool_name)
+            return _STOP_STREAM
+        state["seen_calls"].add(call_key)
+        if state["tool_call_count"] > self.MAX_TOOL_CALLS:
+            logger.warning("Too many tool calls (%d), stopping to prevent loop", state["tool_call_count"])
+            return _STOP_STREAM
+        logger.info("Calling tool %s with args %s", event.tool_name, event.tool_kwargs)
+        state["tool_started"][event.tool_name] = time.monotonic()
+
+    async def _on_tool_result(self, event, state):
+        started = state["tool_started"].pop(event.tool_name, None)
+        if started is not None:
+            _record_tool_latency(event.tool_name, time.monotonic() - started)
+        logger.info("Tool %s completed", event.tool_name)
+
+    # type(event)-keyed dispatch: one dict hit per event instead of an
+    # isinstance chain, which matters when AgentStream fires per token
+    _EVENT_HANDLERS = {
+        AgentStream: _on_agent_stream,
+        ToolCall: _on_tool_call,
+        ToolCallResult: _on_tool_result,
+    }
+
+    async def _run_fast_tier(self, message_content: str, on_delta=None, ctx=None) -> str:
+        """Run a read-only tool invocation on the capped fast LLM.
+
+        Runs with the chat's Context so these turns enter the same
+        conversation history the full agent sees, and with the same
+        repeat/max-call guards as the heavy path.
+        """
+        handler = self.agent_fast.run(message_content, ctx=ctx)
+        streamed_text = ""
+        tool_call_count = 0
+        seen_calls = set()
+        async for event in handler.stream_events():
+            if isinstance(event, AgentStream) and event.delta and on_delta:
+                streamed_text += event.delta
+                on_delta(streamed_text)
+            elif isinstance(event, ToolCall):
+                tool_call_count += 1
+                call_key = (
+                    event.tool_name,
+                    json.dumps(event.tool_kwargs, sort_keys=True, default=str),
+                )
+                if call_key in seen_calls or tool_call_count > self.MAX_TOOL_CALLS:
+                    logger.warning("Fast tier looping on %s, stopping", event.tool_name)
+                    break
+                seen_calls.add(call_key)
+        return str(await handler)
+
+    def _get_ctx(self, chat_id) -> Context:
+        """Return the agent Context for a chat, creating it on first use"""
+        if chat_id is None:
+            return self.agent_context
+
+        now = time.monotonic()
+        entry = self._chat_contexts.get(chat_id)
+        if entry is not None and now - entry[0] < self.CONTEXT_TTL:
+            ctx = entry[1]
+        else:
+            ctx = Context(self.agent)
+        self._chat_contexts[chat_id] = (now, ctx)
+        self._chat_contexts.move_to_end(chat_id)
+
+        # Evict expired entries, then the least recently used over the cap
+        while self._chat_contexts:
+            oldest_id, (seen, _) = next(iter(self._chat_contexts.items()))
+            if oldest_id != chat_id and (
+                now - seen >= self.CONTEXT_TTL
+                or len(self._chat_contexts) > self.MAX_CONTEXTS
+            ):
+                self._chat_contexts.popitem(last=False)
+            else:
+                break
+        return ctx
+
+    async def handle_user_message(self, message_content: str, on_delta=None, chat_id=None) -> str:
+        """Handle user message and return response.
+
+        ``on_delta`` is called with the accumulated response text as LLM
+        tokens stream in, letting the caller show partial output.
+        """
         try:
             if not self.agent or not self.agent_context:
                 return "❌ Meeting scheduler is not initialized. Please try again later."
-            
-            handler = self.agent.run(message_content, ctx=self.agent_context)
-            tool_call_count = 0
-            max_tool_calls = 5  # Prevent infinite loops
-            
-            async for event in handler.stream_events():
-                if isinstance(event, ToolCall):
-                    tool_call_count += 1
-                    if tool_call_count > max_tool_calls:
-                        logger.warning(f"Too many tool calls ({tool_call_count}), stopping to prevent loop")
+
+            # ~0ms regex dispatch for the common fully-specified requests
+            fast_response = await self._try_fast_intent(message_content)
+            if fast_response is not None:
+                if on_delta:
+                    on_delta(fast_response)
+                return fast_response
+
+            # Two-tier routing: short read-shaped messages get the capped
+            # deterministic LLM config; anything else — mutating requests,
+            # or a fast-tier failure — takes the full agent below. The
+            # fallback is safe because the fast agent has no mutating tools
+            if (
+                len(message_content) <= 120
+                and _TOOLY_RE.search(message_content)
+                and not _MUTATING_RE.search(message_content)
+            ):
+                try:
+                    fast = await self._run_fast_tier(
+                        message_content, on_delta, ctx=self._get_ctx(chat_id)
+                    )
+                    if fast.strip():
+                        return fast
+                except Exception as e:
+                    logger.info("Fast tier failed, using full agent: %s", e)
+
+            # Speculatively start the probable calendar read while the LLM
+            # decodes its tool call; only read-only idempotent tools are
+            # eligible, so a wrong guess costs one cancelled request
+            speculation = _speculative_parse(message_content)
+            speculative_task = None
+            if speculation is not None:
+                spec_tool, spec_kwargs = speculation
+                speculative_task = asyncio.create_task(
+                    call_mcp_tool(_get_mcp_clients()[_CALENDAR], spec_tool, spec_kwargs)
+                )
+
+            handler = self.agent.run(message_content, ctx=self._get_ctx(chat_id))
+            state = {
+                "handler": handler,
+                "on_delta": on_delta,
+                "streamed_text": "",
+                "tool_call_count": 0,
+                "seen_calls": set(),
+                "tool_started": {},
+                "speculative_task": speculative_task,
+                "spec_tool": speculation[0] if speculation else None,
+                "spec_kwargs": speculation[1] if speculation else None,
+            }
+
+            try:
+                async for event in handler.stream_events():
+                    event_handler = self._EVENT_HANDLERS.get(type(event))
+                    if event_handler is None:
+                        continue
+                    outcome = await event_handler(self, event, state)
+                    if outcome is _STOP_STREAM:
                         break
-                    logger.info(f"Calling tool {event.tool_name} with args {event.tool_kwargs}")
-                elif isinstance(event, ToolCallResult):
-                    logger.info(f"Tool {event.tool_name} completed")
-            
-            response = await handler
-            return str(response)
+                    if outcome is not None:
+                        return outcome
+
+                response = await handler
+            finally:
+                if state["speculative_task"] is not None:
+                    state["speculative_task"].cancel()
+            # AgentOutput stringifies lazily; skip the conversion when the
+            # result already is a str (fast paths return one directly)
+            return response if isinstance(response, str) else str(response)
             
         except Exception as e:
-            logger.error(f"Error handling user message: {e}")
+            logger.error("Error handling user message: %s", e)
             return f"❌ Sorry, I encountered an error: {str(e)}"
     
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command"""
-        welcome_message = """
-**Meeting Scheduler Bot**
-
-I can help you with:
-• Check availability"
-• Schedule meetings
-• Send emails
-• Get schedule
-• Generate MoM
-
-Just send me a message and I'll help you!
-        """
-        await update.message.reply_text(welcome_message, parse_mode='Markdown')
+        await update.message.reply_text(WELCOME_MESSAGE)
     
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /help command"""
-        help_message = """
-📋 **Available Commands:**
+        await update.message.reply_text(HELP_MESSAGE)
 
-**Availability & Scheduling:**
-• "is [person] free on [date] at [time]"
-• "schedule meeting today"
-• "schedule meeting tomorrow"
-• "what's my schedule on [date]"
+    async def stats_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /stats command: recent per-tool latency percentiles"""
+        stats = get_tool_latency_stats()
+        if not stats:
+            await update.message.reply_text("No tool calls recorded yet.")
+            return
+        lines = ["Tool latency (last 256 calls each):"]
+        for tool_name, s in sorted(stats.items()):
+            lines.append(
+                f"• {tool_name}: n={s['count']} p50={s['p50']:.2f}s p95={s['p95']:.2f}s"
+            )
+        await update.message.reply_text("\n".join(lines))
+    
+    async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Queue an incoming text message for this chat's worker"""
+        chat_id = update.effective_chat.id
+        queue = self._chat_queues.setdefault(chat_id, asyncio.Queue())
+        queue.put_nowait((update, context))
+        worker = self._chat_workers.get(chat_id)
+        if worker is None or worker.done():
+            self._chat_workers[chat_id] = asyncio.create_task(self._chat_worker(chat_id))
 
-**Email & Communication:**
-• "send email to [person]"
-• "generate mom from [transcript]"
+    async def _chat_worker(self, chat_id: int):
+        """Drain one chat's queue, then exit until the next message"""
+        queue = self._chat_queues[chat_id]
+        pending = None
+        while True:
+            if pending is not None:
+                update, context = pending
+                pending = None
+            else:
+                try:
+                    update, context = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    # No awaits between this check and deregistration, so a
+                    # concurrent put cannot strand a message without a worker
+                    self._chat_workers.pop(chat_id, None)
+                    return
+                queue.task_done()
 
-**Examples:**
-• "is arun free on 2025-10-25 at 10:00"
-• "schedule meeting today at 2:00 PM"
-• "send email to arun"
-• "what's my schedule on 2025-10-25"
+            # Coalesce a rapid-fire burst from the same sender into one
+            # LLM turn: fewer Groq calls and fewer outgoing replies, which
+            # also keeps the bot clear of Telegram's per-chat send limits.
+            # The window only opens when a burst is already queued, so the
+            # common single-message case pays no extra latency.
+            texts = [update.message.text]
+            sender = update.message.from_user.id
+            while not queue.empty() or len(texts) > 1:
+                try:
+                    nxt = await asyncio.wait_for(queue.get(), timeout=self.COALESCE_WINDOW)
+                except asyncio.TimeoutError:
+                    break
+                queue.task_done()
+                if nxt[0].message.from_user.id == sender:
+                    update, context = nxt
+                    texts.append(update.message.text)
+                else:
+                    pending = nxt
+                    break
 
-Type any of these commands and I'll help you!
-        """
-        await update.message.reply_text(help_message, parse_mode='Markdown')
-    
-    async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """Handle incoming text messages"""
+            await self._process_message(update, context, text="\n".join(texts))
+
+    async def _process_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE, text=None):
+        """Handle incoming text messages (``text`` overrides the update's
+        own text when the worker has coalesced a burst)"""
         try:
-            user_message = update.message.text
+            user_message = text if text is not None else update.message.text
             user_id = update.message.from_user.id
             username = update.message.from_user.username or "Unknown"
             
-            logger.info(f"Received message from {username} ({user_id}): {user_message}")
+            logger.info("Received message from %s (%s): %s", username, user_id, user_message)
             
             # Show typing indicator
             await context.bot.send_chat_action(chat_id=update.effective_chat.id, action="typing")
-            
-            # Process the message
-            response = await self.handle_user_message(user_message)
-            
-            # Send response back to user
-            await update.message.reply_text(response)
-            
+
+            # Placeholder reply that gets edited as tokens stream in, so the
+            # user sees output at first-token latency instead of waiting for
+            # the whole LLM + tool loop
+            # Respect the per-chat outgoing send budget before creating a
+            # new message (streaming edits are throttled separately)
+            limiter = self._chat_send_limiters.setdefault(
+                update.effective_chat.id, _RateLimiter()
+            )
+            await limiter.acquire()
+            placeholder = await update.message.reply_text("…")
+            chat_id = update.effective_chat.id
+            stream_state = {"text": "", "sent": "…"}
+            done = asyncio.Event()
+
+            def on_delta(text: str):
+                stream_state["text"] = text
+
+            async def edit_loop():
+                # Debounced edits: one edit per interval at most, keeping
+                # well clear of Telegram's per-chat edit rate limits
+                while not done.is_set():
+                    try:
+                        await asyncio.wait_for(done.wait(), timeout=self.STREAM_EDIT_INTERVAL)
+                    except asyncio.TimeoutError:
+                        pass
+                    text = stream_state["text"][: self.MAX_MESSAGE_LEN]
+                    if text and text != stream_state["sent"]:
+                        try:
+                            await context.bot.edit_message_text(
+                                text, chat_id=chat_id, message_id=placeholder.message_id
+                            )
+                            stream_state["sent"] = text
+                        except Exception:
+                            # Rate limit or unchanged text; next tick retries
+                            pass
+
+            editor = asyncio.create_task(edit_loop())
+            try:
+                response = await self.handle_user_message(user_message, on_delta=on_delta, chat_id=chat_id)
+            finally:
+                done.set()
+                await editor
+
+            # Final edit with the complete response, sliced to stay under
+            # Telegram's message length limit: the first chunk replaces the
+            # placeholder, any overflow goes out as follow-up replies
+            chunks = [
+                response[i:i + self.MAX_MESSAGE_LEN]
+                for i in range(0, len(response), self.MAX_MESSAGE_LEN)
+            ] or ["…"]
+            if chunks[0] != stream_state["sent"]:
+                try:
+                    await context.bot.edit_message_text(
+                        chunks[0], chat_id=chat_id, message_id=placeholder.message_id
+                    )
+                except Exception:
+                    await update.message.reply_text(chunks[0])
+            for chunk in chunks[1:]:
+                await update.message.reply_text(chunk)
+
         except Exception as e:
-            logger.error(f"Error handling message: {e}")
+            logger.error("Error handling message: %s", e)
             await update.message.reply_text("❌ Sorry, I encountered an error processing your message.")
     
     async def error_handler(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle errors gracefully"""
-        logger.error(f"Update {update} caused error {context.error}")
+        logger.error("Update %s caused error %s", update, context.error)
         
         if update and update.effective_message:
             await update.effective_message.reply_text(
@@ -239,6 +784,7 @@ Type any of these commands and I'll help you!
             # Add handlers
             application.add_handler(CommandHandler("start", self.start_command))
             application.add_handler(CommandHandler("help", self.help_command))
+            application.add_handler(CommandHandler("stats", self.stats_command))
             application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
             
             # Add error handler
@@ -250,24 +796,52 @@ Type any of these commands and I'll help you!
             await application.initialize()
             await application.start()
             
-            # Start polling
-            await application.updater.start_polling(allowed_updates=Update.ALL_TYPES)
+            # Webhook mode when WEBHOOK_URL is set: Telegram pushes each
+            # update immediately, removing the long-poll round-trip from
+            # the delivery path. The URL must be HTTPS (Telegram requires
+            # TLS; terminate it at a reverse proxy in front of PORT).
+            # Without WEBHOOK_URL, fall back to polling for local runs.
+            webhook_url = os.getenv("WEBHOOK_URL")
+            if webhook_url:
+                await application.updater.start_webhook(
+                    listen="0.0.0.0",
+                    port=int(os.getenv("PORT", 8443)),
+                    url_path=self.telegram_token,
+                    webhook_url=f"{webhook_url.rstrip('/')}/{self.telegram_token}",
+                    allowed_updates=Update.ALL_TYPES,
+                )
+                logger.info("Telegram bot is running (webhook mode)! Press Ctrl+C to stop.")
+            else:
+                await application.updater.start_polling(allowed_updates=Update.ALL_TYPES)
+                logger.info("Telegram bot is running (polling mode)! Press Ctrl+C to stop.")
             
-            logger.info("Telegram bot is running! Press Ctrl+C to stop.")
-            
-            # Keep the bot running
+            # Sleep until a shutdown signal; no 1Hz wake-ups while idle
+            stop = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.add_signal_handler(sig, stop.set)
+                except NotImplementedError:
+                    # Signal handlers are unsupported on this platform
+                    # (e.g. Windows); fall back to KeyboardInterrupt
+                    pass
             try:
-                while True:
-                    await asyncio.sleep(1)
+                await stop.wait()
+                logger.info("Stopping Telegram bot...")
             except KeyboardInterrupt:
                 logger.info("Stopping Telegram bot...")
             finally:
+                for sig in (signal.SIGINT, signal.SIGTERM):
+                    try:
+                        loop.remove_signal_handler(sig)
+                    except (NotImplementedError, ValueError):
+                        pass
                 await application.updater.stop()
                 await application.stop()
                 await application.shutdown()
             
         except Exception as e:
-            logger.error(f"Failed to run Telegram bot: {e}")
+            logger.error("Failed to run Telegram bot: %s", e)
             raise
 
 async def main():
@@ -283,7 +857,7 @@ async def main():
         await bot.run_bot_async()
         
     except Exception as e:
-        logger.error(f"Failed to start Telegram bot: {e}")
+        logger.error("Failed to start Telegram bot: %s", e)
         raise
 
 if __name__ == "__main__":
@@ -1,14 +1,42 @@
 # utils/call_mcp_tool.py
 
-async def call_mcp_tool(client, tool_name: str, args: dict):
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+try:
+    import httpx
+    _TRANSPORT_ERRORS = (httpx.HTTPError, ConnectionError, TimeoutError, OSError)
+except ImportError:  # pragma: no cover - httpx ships with the MCP stack
+    _TRANSPORT_ERRORS = (ConnectionError, TimeoutError, OSError)
+
+
+@dataclass(slots=True)
+class ToolResult:
+    """Normalized outcome of an MCP tool call.
+
+    ``success`` tells callers which branch to take without re-parsing;
+    ``value`` holds the raw CallToolResult on success, ``message`` the
+    error description on failure.
+    """
+    success: bool
+    value: Any = None
+    message: str = ""
+
+
+async def call_mcp_tool(client, tool_name: str, args: dict) -> ToolResult:
     """
     Generic helper to call an MCP tool by name with arguments.
+
+    Only transport-level failures are converted into an unsuccessful
+    ToolResult; programming errors propagate so they surface in tests
+    instead of being swallowed as a failed call.
     """
     try:
         result = await client.call_tool(tool_name, args)
-        return result
-    except Exception as e:
-        return {
-            "success": False,
-            "message": f"Error calling tool {tool_name}: {str(e)}"
-        }
+        return ToolResult(success=True, value=result)
+    except _TRANSPORT_ERRORS as e:
+        logger.warning("Tool %s failed: %s", tool_name, e)
+        return ToolResult(success=False, message=f"Error calling tool {tool_name}: {e}")
@@ -0,0 +1,61 @@
+# utils/contacts.py
+
+import os
+import pickle
+from typing import Dict
+
+# contacts.txt is compiled into a pickled dict on first load; subsequent
+# process starts load the pickle (one O(1) file op) instead of re-parsing
+# line by line. The pickle is rebuilt whenever contacts.txt is newer.
+CONTACTS_FILE = "contacts.txt"
+PICKLE_FILE = "contacts.pkl"
+
+_contacts: Dict[str, str] = None
+_contacts_mtime: float = None
+
+
+def _parse_contacts(file_path: str) -> Dict[str, str]:
+    contacts = {}
+    with open(file_path, "r") as f:
+        for line in f:
+            if "=" in line:
+                name, email = line.strip().split("=", 1)
+                contacts[name.lower().strip()] = email.strip()
+    return contacts
+
+
+def load_contacts(file_path: str = CONTACTS_FILE, pickle_path: str = PICKLE_FILE) -> Dict[str, str]:
+    """Return the {name: email} contact map, cached in memory and on disk.
+
+    The in-memory copy is keyed on the file's mtime, so edits to
+    contacts.txt are picked up on the next call without a restart; the
+    cost per call is a single stat() while the file is unchanged.
+    """
+    global _contacts, _contacts_mtime
+
+    try:
+        mtime = os.path.getmtime(file_path)
+    except OSError:
+        _contacts, _contacts_mtime = {}, None
+        return _contacts
+
+    if _contacts is not None and _contacts_mtime == mtime:
+        return _contacts
+
+    try:
+        if os.path.exists(pickle_path) and os.path.getmtime(pickle_path) >= mtime:
+            with open(pickle_path, "rb") as f:
+                _contacts = pickle.load(f)
+            _contacts_mtime = mtime
+            return _contacts
+    except (OSError, pickle.UnpicklingError):
+        pass  # stale or corrupt pickle; fall through and rebuild
+
+    _contacts = _parse_contacts(file_path)
+    _contacts_mtime = mtime
+    try:
+        with open(pickle_path, "wb") as f:
+            pickle.dump(_contacts, f)
+    except OSError:
+        pass  # read-only filesystem; in-memory cache still works
+    return _contacts